@@ -0,0 +1,152 @@
+import argparse, glob, json, os, sys
+import numpy as np
+
+from constants import WIDTH, HEIGHT
+from eventlog import SPAWN, CLICK, MISS, COLUMNS
+
+# Offline analysis of the event files written by eventlog.EventRecorder
+# (game.py --events DIR, simulate.py --events DIR):
+#
+#   python analysis.py events/ --heatmap clicks.png --json report.json
+#
+# Events from all files are concatenated into one array per column, and every
+# statistic is a whole-array NumPy operation, so millions of events take
+# well under a second.
+
+def load(paths):
+    # paths: .npz files and/or directories of them; returns ({column: array}, hole anchors)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.npz"))))
+        else:
+            files.append(path)
+    if not files:
+        raise ValueError("no event files found")
+
+    holes = None
+    parts = {name: [] for name in COLUMNS}
+    for path in files:
+        with np.load(path) as data:
+            if holes is None:
+                holes = data['holes']
+            elif not np.array_equal(holes, data['holes']):
+                raise ValueError(f"{path} was recorded on a different board")
+            for name in COLUMNS:
+                parts[name].append(data[name])
+    return {name: np.concatenate(arrays) for name, arrays in parts.items()}, holes
+
+
+def hits_mask(events):
+    return (events['kind'] == CLICK) & (events['hole'] >= 0)
+
+
+def hole_rates(events, hole_count):
+    # Per hole: zombies spawned, hit and missed, and hit rate (NaN where nothing spawned)
+    kind, hole = events['kind'], events['hole']
+    spawns = np.bincount(hole[kind == SPAWN], minlength=hole_count)
+    hits = np.bincount(hole[hits_mask(events)], minlength=hole_count)
+    misses = np.bincount(hole[kind == MISS], minlength=hole_count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = hits / spawns
+    return spawns, hits, misses, rate
+
+
+def reaction_histogram(events, bin_ms=50):
+    # Hit reaction times: (counts, bin edges in ms)
+    reaction = events['reaction'][hits_mask(events)]
+    top = bin_ms * (int(reaction.max() // bin_ms) + 1) if reaction.size else bin_ms
+    return np.histogram(reaction, bins=np.arange(0, top + bin_ms, bin_ms))
+
+
+def reaction_percentiles(events, qs=(50, 90, 99)):
+    reaction = events['reaction'][hits_mask(events)]
+    if not reaction.size:
+        return [None for _ in qs]
+    return np.percentile(reaction, qs).tolist()
+
+
+def click_heatmap(events, cell=10, which="all"):
+    # Click counts per cell x cell pixel square, shape (rows, cols);
+    # which: "all", "hits" or "misses" (clicks that hit nothing)
+    mask = events['kind'] == CLICK
+    if which == "hits":
+        mask &= events['hole'] >= 0
+    elif which == "misses":
+        mask &= events['hole'] < 0
+    rows, cols = -(-HEIGHT // cell), -(-WIDTH // cell)
+    counts, _, _ = np.histogram2d(events['y'][mask], events['x'][mask], bins=(rows, cols),
+                                  range=((0, rows * cell), (0, cols * cell)))
+    return counts
+
+
+def save_heatmap(path, counts, holes, cell=10):
+    # counts as an image (black - red - yellow - white, square-root scaled so
+    # sparse areas still show), with each hole's anchor ringed
+    import pygame
+
+    level = np.sqrt(counts / counts.max()) if counts.max() else counts
+    rgb = np.stack([np.clip(3 * level - k, 0, 1) for k in range(3)], axis=-1)
+    pixels = np.repeat(np.repeat((rgb * 255).astype(np.uint8), cell, axis=0), cell, axis=1)
+    surface = pygame.surfarray.make_surface(pixels[:HEIGHT, :WIDTH].transpose(1, 0, 2))
+    for x, y in holes.tolist():
+        pygame.draw.circle(surface, (90, 160, 255), (x, y), 12, 2)
+    pygame.image.save(surface, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze recorded Whack a Zombie events")
+    parser.add_argument("paths", nargs="+", metavar="PATH", help=".npz event files or directories of them")
+    parser.add_argument("--bin", type=int, default=50, metavar="MS", help="reaction histogram bin width")
+    parser.add_argument("--cell", type=int, default=10, metavar="PX", help="heatmap cell size")
+    parser.add_argument("--heatmap", metavar="PNG", help="write a click heatmap image")
+    parser.add_argument("--which", choices=("all", "hits", "misses"), default="all",
+                        help="clicks shown in the heatmap")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    events, holes = load(args.paths)
+    kind = events['kind']
+    clicks = int(np.count_nonzero(kind == CLICK))
+    hits = int(np.count_nonzero(hits_mask(events)))
+    print(f"{kind.size} events: {np.count_nonzero(kind == SPAWN)} spawns, {clicks} clicks "
+          f"({hits} hits), {np.count_nonzero(kind == MISS)} zombies missed")
+
+    spawns, hole_hits, misses, rate = hole_rates(events, len(holes))
+    if len(holes) <= 30:
+        print(f"{'hole':>5}{'x':>6}{'y':>5}{'spawns':>8}{'hits':>7}{'missed':>8}{'rate':>7}")
+        for i, (x, y) in enumerate(holes.tolist()):
+            print(f"{i:5}{x:6}{y:5}{spawns[i]:8}{hole_hits[i]:7}{misses[i]:8}{rate[i]:7.2f}")
+    else:
+        worst, best = np.nanargmin(rate), np.nanargmax(rate)
+        print(f"hit rate per hole: {np.nanmean(rate):.2f} mean, {rate[worst]:.2f} lowest (hole {worst}), "
+              f"{rate[best]:.2f} highest (hole {best})")
+
+    counts, edges = reaction_histogram(events, args.bin)
+    p50, p90, p99 = reaction_percentiles(events)
+    if p50 is not None:
+        print(f"reaction time: p50 {p50:.0f} ms, p90 {p90:.0f} ms, p99 {p99:.0f} ms")
+        scale = 40 / counts.max()
+        for low, count in zip(edges[:-1].tolist(), counts.tolist()):
+            if count:
+                print(f"{low:6.0f} ms {count:9} {'#' * max(1, round(count * scale))}")
+
+    if args.heatmap:
+        save_heatmap(args.heatmap, click_heatmap(events, args.cell, args.which), holes, args.cell)
+    if args.json:
+        report = {
+            'events': int(kind.size),
+            'clicks': clicks,
+            'hits': hits,
+            'holes': [{'hole': i, 'x': x, 'y': y, 'spawns': int(spawns[i]), 'hits': int(hole_hits[i]),
+                       'missed': int(misses[i]), 'hit_rate': None if np.isnan(rate[i]) else float(rate[i])}
+                      for i, (x, y) in enumerate(holes.tolist())],
+            'reaction': {'p50': p50, 'p90': p90, 'p99': p99, 'bin_ms': args.bin, 'histogram': counts.tolist()},
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
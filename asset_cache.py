@@ -0,0 +1,127 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+
+import pygame
+from constants import ASSET_CACHE_DIR
+
+# Entry layout: 16-byte header followed by the raw payload
+#   images: b"ZAYI", width, height, pixel format (b"RGBA" / b"RGB\0")
+#   sounds: b"ZAYS", frequency, sample size (signed), channels
+IMAGE_HEADER = struct.Struct("<4sII4s")
+SOUND_HEADER = struct.Struct("<4sIiI")
+
+class AssetCache:
+    # Build-once cache of decoded assets: scaled image pixels and decoded PCM.
+    # Entries are keyed on the source path plus target size (or mixer format) and
+    # are rebuilt when the source file's mtime and content hash no longer match.
+    def __init__(self, directory=ASSET_CACHE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()  # assets may be loaded from worker threads
+        try:
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def image(self, path, size):
+        # Decoded image scaled to size; not yet converted to the display format
+        key = f"{path}|{size[0]}x{size[1]}"
+        mm = self.open_entry(key, path)
+        if mm is not None:
+            magic, w, h, fmt = IMAGE_HEADER.unpack_from(mm)
+            if magic == b"ZAYI" and (w, h) == tuple(size):
+                self.hits += 1
+                # Zero-copy: the surface keeps the mapping alive
+                return pygame.image.frombuffer(memoryview(mm)[IMAGE_HEADER.size:], (w, h), fmt.rstrip(b"\0").decode())
+
+        self.misses += 1
+        surface = pygame.transform.scale(pygame.image.load(path), size)
+        fmt = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+        header = IMAGE_HEADER.pack(b"ZAYI", size[0], size[1], fmt.encode().ljust(4, b"\0"))
+        self.store_entry(key, path, header, pygame.image.tobytes(surface, fmt))
+        return surface
+
+    def sound(self, path):
+        # Decoded PCM in the current mixer format
+        freq, sample_size, channels = pygame.mixer.get_init()
+        key = f"{path}|{freq}/{sample_size}/{channels}"
+        mm = self.open_entry(key, path)
+        if mm is not None:
+            magic, f, s, c = SOUND_HEADER.unpack_from(mm)
+            if magic == b"ZAYS" and (f, s, c) == (freq, sample_size, channels):
+                self.hits += 1
+                sound = pygame.mixer.Sound(buffer=memoryview(mm)[SOUND_HEADER.size:])
+                mm.close()
+                return sound
+
+        self.misses += 1
+        sound = pygame.mixer.Sound(path)
+        header = SOUND_HEADER.pack(b"ZAYS", freq, sample_size, channels)
+        self.store_entry(key, path, header, sound.get_raw())
+        return sound
+
+    def open_entry(self, key, path):
+        # Memory-map a fresh cache entry, or return None if it is missing or stale
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return None
+            try:
+                st = os.stat(path)
+                if (entry['mtime_ns'], entry['size']) != (st.st_mtime_ns, st.st_size):
+                    # Touched but maybe not changed: fall back to the content hash
+                    if st.st_size != entry['size'] or file_hash(path) != entry['sha1']:
+                        return None
+                    entry['mtime_ns'] = st.st_mtime_ns
+                    self.save_index()
+                with open(os.path.join(self.directory, entry['file']), "rb") as f:
+                    # Copy-on-write mapping so surfaces built on it can never write to the file
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            except (OSError, ValueError):
+                return None
+
+    def store_entry(self, key, path, header, payload):
+        # The cache is an optimization only; failing to write it is not an error
+        with self.lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                st = os.stat(path)
+                name = hashlib.sha1(key.encode()).hexdigest() + ".bin"
+                tmp = os.path.join(self.directory, name + ".tmp")
+                with open(tmp, "wb") as f:
+                    f.write(header)
+                    f.write(payload)
+                os.replace(tmp, os.path.join(self.directory, name))
+                self.index[key] = {
+                    'file': name,
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'sha1': file_hash(path),
+                }
+                self.save_index()
+            except OSError:
+                pass
+
+    def save_index(self):
+        try:
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.index, f, indent=1)
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -1,44 +1,168 @@
 import pygame
-from constants import WIDTH, HEIGHT
+from concurrent.futures import ThreadPoolExecutor
+from constants import WIDTH, HEIGHT, HAMMER_SWING_ANGLE, HAMMER_SWING_FRAMES, HAMMER_SMOOTH, FADE_LEVELS, LOADER_THREADS
+from constants import RED_HIT_PITCH
+from asset_cache import AssetCache
+from atlas import SpriteAtlas
+
+# Source file and target size of each game image
+IMAGES = {
+    'intro_bg': ("images/intro_bg.jpg", (WIDTH, HEIGHT)),
+    'game_bg': ("images/background.jpg", (WIDTH, HEIGHT)),
+    'hole': ("images/hole.png", (200, 150)),
+    'hammer': ("images/hammer.png", (80, 80)),
+}
+ZOMBIE_COLORS = ("red", "green")
+ZOMBIE_SIZE = (120, 150)
+HIT_SOUND = "assets/sound/Cartoon Boing.mp3"
+MUSIC = "assets/sound/background-theme.mp3"
 
 class AssetLoader:
+    # Set to None to always decode from the source files
+    cache = AssetCache()
+
+    @staticmethod
+    def load_scaled(path, size):
+        # Decoded image scaled to size, from the on-disk cache when it is fresh
+        if AssetLoader.cache is not None:
+            return AssetLoader.cache.image(path, size)
+        return pygame.transform.scale(pygame.image.load(path), size)
+
     @staticmethod
-    def load_images():
-        # Load and scale all game images
+    def to_display(surface):
+        # Convert to the display format; needs the window and must run on the main thread
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    @staticmethod
+    def finish_images(raw):
+        # Main-thread half of image loading (after load_scaled): conversion and derived frames
+        images = {name: AssetLoader.to_display(surface) for name, surface in raw.items()}
+        images['hammer_swing'] = AssetLoader.load_hammer_swing(images['hammer'])
+        return images
+
+    @staticmethod
+    def load_hammer_swing(hammer, frames=HAMMER_SWING_FRAMES, max_angle=HAMMER_SWING_ANGLE,
+                          smooth=HAMMER_SMOOTH):
+        # frames[i] is the hammer rotated by max_angle * i / (frames - 1); frames[0] is upright
+        swing = [hammer]
+        for i in range(1, frames):
+            angle = max_angle * i / (frames - 1)
+            if smooth:
+                swing.append(pygame.transform.rotozoom(hammer, angle, 1))
+            else:
+                swing.append(pygame.transform.rotate(hammer, angle))
+        return swing
+
+    @staticmethod
+    def decode_zombie_frames(color, size=ZOMBIE_SIZE):
+        # Thread-safe half of zombie frame loading (finish_zombie_frames converts): decode and scale only
         return {
-            'intro_bg': pygame.transform.scale(pygame.image.load("images/intro_bg.jpg"), (WIDTH, HEIGHT)),
-            'game_bg': pygame.transform.scale(pygame.image.load("images/background.jpg"), (WIDTH, HEIGHT)),
-            'hole': pygame.transform.scale(pygame.image.load("images/hole.png"), (200, 150)),
-            'hammer': pygame.transform.scale(pygame.image.load("images/hammer.png"), (80, 80))
+            "idle": [
+                AssetLoader.load_scaled(f"assets/{color}/idle/frame-1.png", size),
+                AssetLoader.load_scaled(f"assets/{color}/idle/frame-2.png", size),
+            ],
+            "dead": [
+                AssetLoader.load_scaled(f"assets/{color}/got-hit/frame-1.png", size),
+                AssetLoader.load_scaled(f"assets/{color}/got-hit/frame-2.png", size),
+            ],
         }
 
     @staticmethod
-    def load_zombie_frames(color):
-        idle = [
-            pygame.image.load(f"assets/{color}/idle/frame-1.png"),
-            pygame.image.load(f"assets/{color}/idle/frame-2.png"),
-        ]
-        dead = [
-            pygame.image.load(f"assets/{color}/got-hit/frame-1.png"),
-            pygame.image.load(f"assets/{color}/got-hit/frame-2.png"),
-        ]
+    def finish_zombie_frames(raw):
+        idle = [img.convert_alpha() for img in raw["idle"]]
+        dead = [img.convert_alpha() for img in raw["dead"]]
 
-        idle = [pygame.transform.scale(img, (120,150)) for img in idle]
-        dead = [pygame.transform.scale(img, (120,150)) for img in dead]
+        return {"idle": idle, "dead": dead, "fade": [AssetLoader.load_fade(img) for img in dead]}
 
-        return {"idle": idle, "dead": dead}
+    @staticmethod
+    def load_fade(image, levels=FADE_LEVELS):
+        # fade[i] is image with its per-pixel alpha scaled by i / (levels - 1)
+        fade = []
+        for i in range(levels - 1):
+            faded = image.copy()
+            faded.fill((255, 255, 255, 255 * i // (levels - 1)), special_flags=pygame.BLEND_RGBA_MULT)
+            fade.append(faded)
+        fade.append(image)
+        return fade
+
+    @staticmethod
+    def build_atlas(images, zombie_frames):
+        # Moves the hole, the hammer swing and every zombie frame into one atlas
+        # (main thread: it converts). Returns the atlas and, per color, the
+        # zombie frame table with atlas rects in place of surfaces.
+        atlas = SpriteAtlas()
+        atlas.add('hole', images.pop('hole'))
+        atlas.add('hammer', images.pop('hammer_swing'))  # frame 0 is the upright hammer
+        del images['hammer']
+        for color, frames in zombie_frames.items():
+            atlas.add(color, frames)
+        atlas.pack()
+        return atlas, {color: {**atlas[color], "atlas": atlas.surface} for color in zombie_frames}
 
     @staticmethod
-    def load_sounds():
-        # Load sound effects
-        pygame.mixer.music.load("assets/sound/background-theme.mp3")
+    def start_music():
+        # Music is streamed by the mixer, so this only opens the file
+        pygame.mixer.music.load(MUSIC)
         pygame.mixer.music.play(-1)
-        boing_sound = pygame.mixer.Sound("assets/sound/Cartoon Boing.mp3")
-        return boing_sound
 
     @staticmethod
-    def load_fonts():
+    def load_effect(path):
+        # Effects are decoded once and cached as PCM
+        if AssetLoader.cache is not None:
+            return AssetLoader.cache.sound(path)
+        return pygame.mixer.Sound(path)
+
+    @staticmethod
+    def load_hit_sounds():
+        # One hit sound per zombie color; red gets a higher-pitched boing
+        green = AssetLoader.load_effect(HIT_SOUND)
+        return {"green": green, "red": AssetLoader.pitch_shift(green, RED_HIT_PITCH)}
+
+    @staticmethod
+    def pitch_shift(sound, semitones):
+        # Resampled copy of sound, semitones higher (and shorter to match)
+        import numpy as np
+        samples = pygame.sndarray.array(sound)
+        positions = np.arange(0, len(samples) - 1, 2 ** (semitones / 12))
+        index = positions.astype(int)
+        frac = positions - index
+        if samples.ndim > 1:
+            frac = frac[:, None]
+        shifted = samples[index] * (1 - frac) + samples[index + 1] * frac
+        return pygame.sndarray.make_sound(np.ascontiguousarray(shifted.astype(samples.dtype)))
+
+    @staticmethod
+    def load_fonts(scale=1.0):
         return {
-            'large': pygame.font.SysFont(None, 80),
-            'small': pygame.font.SysFont(None, 40)
+            'large': pygame.font.SysFont(None, round(80 * scale)),
+            'small': pygame.font.SysFont(None, round(40 * scale)),
+            'mono': pygame.font.SysFont("monospace", round(18 * scale))
         }
+
+
+class BackgroundLoader:
+    # Runs decode jobs on a thread pool. Results are raw (unconverted) assets;
+    # converting them to the display format is left to the main thread.
+    def __init__(self, workers=LOADER_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.jobs = {}
+
+    def submit(self, name, fn, *args):
+        self.jobs[name] = self.executor.submit(fn, *args)
+
+    def result(self, name):
+        # Blocks until the job is done; re-raises any error from the worker
+        return self.jobs[name].result()
+
+    def progress(self):
+        if not self.jobs:
+            return 1.0
+        return sum(job.done() for job in self.jobs.values()) / len(self.jobs)
+
+    def done(self):
+        return all(job.done() for job in self.jobs.values())
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,83 @@
+import pygame
+from constants import ATLAS_WIDTH
+
+class SpriteAtlas:
+    # Sprite frames packed into one surface. Sprites are registered under a key
+    # as a Surface or a nested list/dict of them; after pack(), atlas[key] has
+    # the same shape with each Surface replaced by its Rect in the atlas, ready
+    # for area blits (screen.blit(atlas.surface, pos, rect) or Surface.blits).
+    def __init__(self, max_width=ATLAS_WIDTH):
+        self.max_width = max_width
+        self.entries = {}
+        self.surface = None
+        self.rects = {}
+
+    def add(self, key, sprites):
+        self.entries[key] = sprites
+
+    def __getitem__(self, key):
+        return self.rects[key]
+
+    def pack(self):
+        # Shelf packing, tallest first; a surface registered twice is stored once
+        unique = {}
+        for sprites in self.entries.values():
+            for surface in flatten(sprites):
+                unique[id(surface)] = surface
+        order = sorted(unique.values(), key=lambda s: (s.get_height(), s.get_width()), reverse=True)
+
+        placed = {}
+        x = y = shelf = width = 0
+        for surface in order:
+            w, h = surface.get_size()
+            if x and x + w > self.max_width:
+                x, y, shelf = 0, y + shelf, 0
+            placed[id(surface)] = pygame.Rect(x, y, w, h)
+            x += w
+            shelf = max(shelf, h)
+            width = max(width, x)
+
+        self.surface = pygame.Surface((max(width, 1), max(y + shelf, 1)), pygame.SRCALPHA).convert_alpha()
+        for surface in order:
+            # MAX onto the cleared atlas copies pixels exactly, alpha included
+            self.surface.blit(surface, placed[id(surface)], special_flags=pygame.BLEND_RGBA_MAX)
+        self.rects = {key: walk(sprites, lambda surface: placed[id(surface)])
+                      for key, sprites in self.entries.items()}
+        self.entries = {}  # drop the references so the source surfaces can be freed
+
+    def scaled(self, factor):
+        # A packed copy with every sprite smoothscaled by factor, plus a map from
+        # id() of each rect here to the matching rect in the copy
+        scaled = {}
+        def scale(rect):
+            key = tuple(rect)
+            if key not in scaled:
+                size = (max(1, round(rect.width * factor)), max(1, round(rect.height * factor)))
+                scaled[key] = pygame.transform.smoothscale(self.surface.subsurface(rect), size)
+            return scaled[key]
+
+        atlas = SpriteAtlas(self.max_width)
+        for key, rects in self.rects.items():
+            atlas.add(key, walk(rects, scale))
+        atlas.pack()
+        areas = {id(rect): copy for key in self.rects
+                 for rect, copy in zip(flatten(self.rects[key]), flatten(atlas.rects[key]))}
+        return atlas, areas
+
+
+# Sprite tables are nested lists/dicts with a Surface or Rect at each leaf
+def flatten(sprites):
+    if isinstance(sprites, (pygame.Surface, pygame.Rect)):
+        yield sprites
+    else:
+        for item in (sprites.values() if isinstance(sprites, dict) else sprites):
+            yield from flatten(item)
+
+
+def walk(sprites, fn):
+    # Same shape with fn applied to every leaf
+    if isinstance(sprites, (pygame.Surface, pygame.Rect)):
+        return fn(sprites)
+    if isinstance(sprites, dict):
+        return {name: walk(item, fn) for name, item in sprites.items()}
+    return [walk(item, fn) for item in sprites]
@@ -0,0 +1,57 @@
+import time
+from array import array
+
+import pygame
+from constants import AUDIO_BUFFER, EFFECT_CHANNELS
+
+class AudioSystem:
+    # Sound effects on a fixed set of reserved mixer channels. When all of them
+    # are busy the voice that has been playing longest is cut off, so a new hit
+    # is never dropped or queued behind older ones.
+    #
+    # Latency is measured from when the frame's input was read to the play call,
+    # plus one mixer buffer: the earliest the sound can reach the output.
+    def __init__(self, channels=EFFECT_CHANNELS, history=256):
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        pygame.mixer.set_reserved(channels)  # Sound.play() elsewhere never takes these
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.started = [0.0] * channels  # perf_counter when each channel last started
+        self.sounds = {}
+        self.steals = 0
+
+        freq = pygame.mixer.get_init()[0]
+        self.buffer_ms = AUDIO_BUFFER * 1000 / freq
+        self.latency = array('d', bytes(8 * history))  # ring buffer of the last measurements, ms
+        self.played = 0
+
+    def load(self, sounds):
+        # sounds: name -> pygame.mixer.Sound (decoded PCM)
+        self.sounds.update(sounds)
+
+    def play(self, name, input_time=None):
+        i = self.free_channel()
+        self.channels[i].play(self.sounds[name])
+        now = time.perf_counter()
+        self.started[i] = now
+        if input_time is not None:
+            self.latency[self.played % len(self.latency)] = (now - input_time) * 1000 + self.buffer_ms
+            self.played += 1
+
+    def free_channel(self):
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+        # Voice stealing: take over the channel that started first
+        self.steals += 1
+        return min(range(len(self.channels)), key=self.started.__getitem__)
+
+    def latency_percentiles(self, qs=(50, 95, 99)):
+        data = sorted(self.latency[:min(self.played, len(self.latency))])
+        if not data:
+            return [0.0 for _ in qs]
+        return [data[min(len(data) - 1, len(data) * q // 100)] for q in qs]
+
+    def overlay_lines(self):
+        # Extra lines for the profiler overlay
+        p50, p95, p99 = self.latency_percentiles()
+        return [f"{'audio':<8}{p50:7.2f}{p95:7.2f}{p99:7.2f}", f"{self.steals} voices stolen"]
@@ -0,0 +1,253 @@
+import os
+
+# Headless: SDL's dummy drivers must be selected before pygame initializes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, json, random, sys, time, tracemalloc
+import pygame
+
+from constants import SIM_STEP, IDLE_DURATION
+from board import BoardLayout
+from game import WhackAZombie, board_size
+
+# Scripted scenarios for the update, spawn, click and render hot paths.
+#
+#   python benchmark.py                      run everything and print a table
+#   python benchmark.py --save               store the results as the baseline
+#   python benchmark.py --check              fail if anything regressed past --threshold
+#
+# "alloc KB/frame" is the Python heap churn inside a frame (tracemalloc peak
+# above the frame's starting point), measured in a separate, untimed pass.
+
+def new_game(layout, engine):
+    game = WhackAZombie(layout, engine, music=False)
+    game.wait_for_assets()
+    start_round(game)
+    return game
+
+
+def start_round(game):
+    game.spawn_interval = float("inf") # Scenarios spawn explicitly
+    game.clear_zombies()
+    game.game_state.reset()
+    game.game_state.state = "play"
+    game.game_state.time_left = 10**9 # Rounds never end during a benchmark
+    game.hammer_state['cursor_visible'] = False
+    game.ui.invalidate()
+
+
+def free_holes(game):
+    if game.field is not None:
+        return game.field.free_slots().size
+    return game.hole_index.free_count()
+
+
+def fill_board(game, linger=True):
+    while free_holes(game):
+        game.spawn_wave()
+    if linger:
+        # Keep zombies up instead of letting them fall back
+        game.idle_duration = float("inf")
+        if game.field is not None:
+            game.field.idle_duration = float("inf")
+        for zombie in game.zombies:
+            zombie.idle_duration = float("inf")
+
+
+def draw_play(game):
+    zombies = game.field if game.field is not None else game.hole_index.occupants
+    dirty = game.ui.draw_play(game.game_state, game.holes, zombies, game.hammer_state, 0.5)
+    if dirty is not None:
+        pygame.display.update(dirty)
+    else:
+        pygame.display.update()
+
+
+def play_frame(game):
+    game.step(SIM_STEP)
+    draw_play(game)
+
+
+# Each scenario is (setup, frame); setup runs once before warm-up
+def idle_board():
+    return (lambda game: None), play_frame
+
+
+def full_board():
+    return fill_board, play_frame
+
+
+def update_only():
+    return fill_board, (lambda game: game.step(SIM_STEP))
+
+
+def spawn_waves():
+    def frame(game):
+        game.clear_zombies()
+        fill_board(game, linger=False)
+    return (lambda game: None), frame
+
+
+def click_storm(clicks_per_frame=20):
+    rng = random.Random(1)
+    def frame(game):
+        points = game.layout.aim_points()
+        for _ in range(clicks_per_frame):
+            # Half aimed at zombies, half anywhere
+            pos = rng.choice(points) if rng.random() < 0.5 else (rng.randrange(game.screen.get_width()), rng.randrange(game.screen.get_height()))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos))
+        game.handle_events()
+        play_frame(game)
+        fill_board(game)
+    return fill_board, frame
+
+
+def concurrent_fades():
+    def frame(game):
+        if not free_holes(game):
+            # Whack everything at once, then watch the fades
+            game.resolve_clicks(game.layout.aim_points())
+        play_frame(game)
+        fill_board(game)
+    return fill_board, frame
+
+
+def pause_screen():
+    def frame(game):
+        game.ui.draw_pause()
+        pygame.display.update()
+    return fill_board, frame
+
+
+def timesup_screen():
+    def frame(game):
+        game.ui.draw_timesup(game.game_state)
+        pygame.display.update()
+    return fill_board, frame
+
+
+SCENARIOS = {
+    'idle_board': idle_board,
+    'full_board': full_board,
+    'update_only': update_only,
+    'spawn_waves': spawn_waves,
+    'click_storm': click_storm,
+    'concurrent_fades': concurrent_fades,
+    'pause_screen': pause_screen,
+    'timesup_screen': timesup_screen,
+}
+
+
+def run_scenario(game, name, frames, warmup=30):
+    setup, frame = SCENARIOS[name]()
+    start_round(game)
+    game.idle_duration = IDLE_DURATION
+    for zombie in game.zombies:
+        zombie.idle_duration = IDLE_DURATION
+    if game.field is not None:
+        game.field.idle_duration = IDLE_DURATION
+    setup(game)
+    for _ in range(warmup):
+        frame(game)
+
+    times = []
+    for _ in range(frames):
+        t = time.perf_counter()
+        frame(game)
+        times.append(time.perf_counter() - t)
+
+    # Allocation pass, untimed since tracing slows everything down
+    churn = []
+    tracemalloc.start()
+    for _ in range(min(frames, 60)):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame(game)
+        churn.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    times.sort()
+    mean = sum(times) / len(times)
+    return {
+        'fps': 1 / mean,
+        'ms_mean': mean * 1000,
+        'ms_p95': times[len(times) * 95 // 100] * 1000,
+        'alloc_kb_per_frame': sum(churn) / len(churn) / 1024,
+    }
+
+
+def check(results, baseline, threshold):
+    # Regressions: fps dropping, or heap churn growing, by more than threshold
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['fps'] < base['fps'] * (1 - threshold):
+            failures.append(f"{name}: {result['fps']:.0f} fps vs baseline {base['fps']:.0f}")
+        if result['alloc_kb_per_frame'] > base['alloc_kb_per_frame'] * (1 + threshold) + 1:
+            failures.append(f"{name}: {result['alloc_kb_per_frame']:.1f} KB/frame vs baseline "
+                            f"{base['alloc_kb_per_frame']:.1f}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Whack a Zombie benchmarks")
+    parser.add_argument("scenarios", nargs="*", metavar="scenario",
+                        help=f"scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--board", type=board_size, metavar="ROWSxCOLS")
+    parser.add_argument("--engine", choices=("objects", "arrays"), default="objects")
+    parser.add_argument("--render-scale", type=float, default=1.0, metavar="SCALE",
+                        help="play field render resolution relative to the window")
+    parser.add_argument("--baseline", default="benchmark_baseline.json", metavar="PATH")
+    parser.add_argument("--save", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--check", action="store_true", help="compare against the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed relative regression for --check (default 0.15)")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name!r}")
+
+    layout = BoardLayout.grid(*args.board) if args.board else None
+    game = new_game(layout, args.engine)
+    game.set_render_scale(args.render_scale)
+    # Baselines are kept per board/engine/render scale configuration
+    config = f"{args.engine}/{'x'.join(map(str, args.board)) if args.board else 'classic'}"
+    if args.render_scale != 1:
+        config += f"@{args.render_scale:g}"
+
+    results = {}
+    print(f"{'scenario':<18}{'fps':>9}{'ms mean':>9}{'ms p95':>9}{'alloc KB/frame':>16}")
+    for name in args.scenarios or SCENARIOS:
+        result = results[name] = run_scenario(game, name, args.frames)
+        print(f"{name:<18}{result['fps']:9.0f}{result['ms_mean']:9.3f}{result['ms_p95']:9.3f}"
+              f"{result['alloc_kb_per_frame']:16.2f}")
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    status = 0
+    if args.check:
+        if config not in stored:
+            print(f"no baseline for {config} in {args.baseline}")
+            status = 1
+        else:
+            failures = check(results, stored[config], args.threshold)
+            for failure in failures:
+                print("REGRESSION", failure)
+            status = 1 if failures else 0
+    if args.save:
+        stored.setdefault(config, {}).update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2)
+        print(f"baseline for {config} saved to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import pygame
+from constants import WIDTH, HEIGHT, HIT_CELL_SIZE, PLAY_AREA
+from assets import ZOMBIE_SIZE
+
+HOLE_SIZE = (200, 150)
+# Footprint of one hole at scale 1: the classic spacing, with room above the
+# hole for a fully risen zombie (which reaches 70 px above the hole's top)
+CELL_SIZE = (325, 220)
+HEADROOM = 70
+
+class BoardLayout:
+    # Hole positions plus the sprite geometry that goes with them
+    def __init__(self, holes, scale=1.0):
+        self.holes = holes
+        self.scale = scale
+        self.hole_size = (round(HOLE_SIZE[0] * scale), round(HOLE_SIZE[1] * scale))
+        self.zombie_size = (round(ZOMBIE_SIZE[0] * scale), round(ZOMBIE_SIZE[1] * scale))
+        self.rise = 40 * scale
+
+    def anchor(self, pos):
+        # Zombie midbottom when sunk into the hole at pos
+        return (pos[0] + round(100 * self.scale), pos[1] + round(120 * self.scale))
+
+    def aim_points(self):
+        # One point per hole that is inside its zombie whether rising, idle or falling
+        return [(x, round(y - self.rise) - 5) for x, y in map(self.anchor, self.holes)]
+
+    @staticmethod
+    def classic():
+        return BoardLayout([(125, 450), (450, 450), (775, 450),
+                            (125, 650), (450, 650), (775, 650)])
+
+    @staticmethod
+    def grid(rows, cols, area=PLAY_AREA):
+        # rows x cols holes spread over area, sprites shrunk to fit (never enlarged)
+        x0, y0, width, height = area
+        cell_w, cell_h = width / cols, height / rows
+        scale = min(cell_w / CELL_SIZE[0], cell_h / CELL_SIZE[1], 1.0)
+        hole_w = HOLE_SIZE[0] * scale
+        footprint = (HEADROOM + HOLE_SIZE[1]) * scale
+        holes = []
+        for r in range(rows):
+            for c in range(cols):
+                x = x0 + (c + 0.5) * cell_w - hole_w / 2
+                y = y0 + r * cell_h + (cell_h - footprint) / 2 + HEADROOM * scale
+                holes.append((round(x), round(y)))
+        return BoardLayout(holes, scale)
+
+
+def hole_region(pos, layout):
+    # Screen area a zombie from this hole can cover, from sunk to fully risen
+    width, height = layout.zombie_size
+    x, bottom = layout.anchor(pos)
+    rise = int(layout.rise + 0.5)
+    return pygame.Rect(x - width // 2, bottom - height - rise, width, height + rise)
+
+
+class HoleIndex:
+    # Uniform grid over the screen mapping each cell to the holes whose zombies
+    # can reach it, plus the zombie currently occupying each hole. A click only
+    # checks the few holes listed for its cell.
+    def __init__(self, layout, cell_size=HIT_CELL_SIZE):
+        self.holes = layout.holes
+        self.slots = {pos: i for i, pos in enumerate(self.holes)}
+        self.occupants = [None] * len(self.holes)  # drawn in this order
+        # Free holes as a swap-remove list, with each slot's position in it (-1 when occupied)
+        self.free = list(range(len(self.holes)))
+        self.free_at = list(range(len(self.holes)))
+
+        self.cell_size = cell_size
+        self.cols = -(-WIDTH // cell_size)
+        self.rows = -(-HEIGHT // cell_size)
+        cells = [[] for _ in range(self.cols * self.rows)]
+        for slot, pos in enumerate(self.holes):
+            region = hole_region(pos, layout).clip(pygame.Rect(0, 0, WIDTH, HEIGHT))
+            for cy in range(region.top // cell_size, (region.bottom - 1) // cell_size + 1):
+                for cx in range(region.left // cell_size, (region.right - 1) // cell_size + 1):
+                    cells[cy * self.cols + cx].append(slot)
+        # Later holes are drawn on top, so they are tried first
+        self.cells = [tuple(reversed(c)) for c in cells]
+
+    def occupy(self, zombie):
+        slot = self.slots[zombie.current_hole]
+        self.occupants[slot] = zombie
+        # O(1) removal from the free list: move the last entry into its place
+        i = self.free_at[slot]
+        last = self.free.pop()
+        if last != slot:
+            self.free[i] = last
+            self.free_at[last] = i
+        self.free_at[slot] = -1
+
+    def release(self, zombie):
+        slot = self.slots.get(zombie.current_hole)
+        if slot is not None and self.occupants[slot] is zombie:
+            self.occupants[slot] = None
+            self.free_at[slot] = len(self.free)
+            self.free.append(slot)
+
+    def clear(self):
+        self.free.clear()
+        for slot in range(len(self.occupants)):
+            self.occupants[slot] = None
+            self.free_at[slot] = slot
+            self.free.append(slot)
+
+    def free_count(self):
+        return len(self.free)
+
+    def random_free(self, rng):
+        # A random unoccupied hole position, or None when the board is full
+        if not self.free:
+            return None
+        return self.holes[self.free[rng.randrange(len(self.free))]]
+
+    def candidates(self, pos):
+        x, y = pos
+        if not (0 <= x < WIDTH and 0 <= y < HEIGHT):
+            return ()
+        return self.cells[(y // self.cell_size) * self.cols + x // self.cell_size]
+
+    def hit(self, pos):
+        # Topmost zombie under pos that can still be hit (and marks it hit), or None
+        for slot in self.candidates(pos):
+            zombie = self.occupants[slot]
+            if zombie is not None and zombie.check_hit(pos):
+                return zombie
+        return None
@@ -2,8 +2,89 @@ import pygame
 
 # --- Constants ---
 WIDTH, HEIGHT = 1100, 800
-FPS = 60
+FPS = 60  # frame cap during play (0 = uncapped)
+
+# Menus and pause sleep until input arrives, waking at least this often (ms);
+# more often while assets are still loading, to update the progress bar
+IDLE_WAIT = 1000
+LOADING_WAIT = 50
+
+# Only repaint and update the parts of the screen that changed during play
+DIRTY_RECTS = True
+
+# Number of rendered text surfaces kept by the UI's LRU text cache
+TEXT_CACHE_SIZE = 128
+
+# Hammer swing: rotations are pre-baked at load time into a quantized table
+HAMMER_SWING_ANGLE = 45
+HAMMER_SWING_FRAMES = 16
+HAMMER_SMOOTH = False  # use rotozoom (antialiased) instead of plain rotate
+
+# Number of pre-baked alpha levels for the zombie got-hit fade
+FADE_LEVELS = 16
+
+# Window size relative to WIDTH x HEIGHT, and the play field's internal render
+# resolution relative to the window. Below 1 the play field is drawn to a
+# smaller backbuffer and scaled up to the window once per frame.
+WINDOW_SCALE = 1.0
+RENDER_SCALE = 1.0
+# Automatic render scale: steps through these levels, judging the mean frame
+# time over AUTO_RES_FRAMES play frames against the frame budget
+RENDER_SCALES = (1.0, 0.75, 0.5)
+AUTO_RES_FRAMES = 60
+
+# Maximum width (px) of the sprite atlas; sprites are packed in rows up to it
+ATLAS_WIDTH = 2048
+
+# On-disk cache of decoded/scaled assets (rebuilt when source files change)
+ASSET_CACHE_DIR = ".asset_cache"
+
+# Worker threads used to decode assets while the intro screen is up
+LOADER_THREADS = 4
+
+# Cell size (px) of the grid used to look up which holes a click can hit
+HIT_CELL_SIZE = 50
+
+# Screen area (x, y, w, h) below the HUD that generated boards are laid out in
+PLAY_AREA = (0, 150, WIDTH, HEIGHT - 150)
+
+# Zombie engine: "objects" (one Zombie per sprite) or "arrays" (NumPy, for large boards)
+ENGINE = "objects"
+
+# Above this many rects, a full display update is cheaper than a dirty-rect one
+DIRTY_RECT_LIMIT = 64
+
+# Frames kept in the profiler's ring buffer (about 10 s at 60 FPS)
+PROFILE_FRAMES = 600
+
+# Difficulty: ms between waves, zombies per wave on the classic board (min, max;
+# scaled up with the hole count), ms a risen zombie stays up, share of red zombies
+SPAWN_INTERVAL = 2000
+WAVE_SIZE = (1, 4)
+IDLE_DURATION = 1000
+RED_RATIO = 0.2
+
+# Mixer setup: a small buffer keeps hit sounds close to the click
+# (AUDIO_BUFFER samples is about 6 ms at 44.1 kHz)
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 256
+EFFECT_CHANNELS = 8  # reserved channels for hit sounds
+RED_HIT_PITCH = 4  # red zombies' hit sound is the green one this many semitones up
+
+# Play statistics (stats.py): SQLite database, and how events are batched
+# before the writer thread commits them (whichever limit comes first)
+STATS_DB = "stats.db"
+STATS_BATCH = 512
+STATS_FLUSH_MS = 500
+
+# Rows the event recorder (eventlog.py) preallocates per column; it doubles when full
+EVENT_BUFFER = 4096
 
 # Colors
 WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
\ No newline at end of file
+BLACK = (0, 0, 0)
+
+# Simulation runs at a fixed rate, independent of the display frame rate
+SIM_HZ = 60
+SIM_STEP = 1000 / SIM_HZ  # ms per simulation step
+MAX_SIM_STEPS = 5  # catch-up steps per frame before dropping the backlog
@@ -0,0 +1,89 @@
+import os, time
+import numpy as np
+
+from constants import EVENT_BUFFER
+
+# Gameplay events for offline analysis (analysis.py), one row per event:
+#   SPAWN  a zombie appeared: hole, color
+#   CLICK  a hammer click: x, y, plus hole, color and reaction time (ms since
+#          the zombie appeared) when it hit one; hole -1 for a miss
+#   MISS   a zombie sank back unhit: hole, color
+# t is simulated time in ms. Each flush writes one compressed .npz holding a
+# column per field plus the board's hole anchors ('holes', n x 2).
+SPAWN, CLICK, MISS = range(3)
+COLORS = ("green", "red")
+COLUMNS = {
+    'kind': np.int8,
+    'round': np.int32,
+    't': np.float64,
+    'hole': np.int32,
+    'color': np.int8,
+    'x': np.int16,
+    'y': np.int16,
+    'reaction': np.float32,
+}
+
+class EventRecorder:
+    # Columnar buffer: one preallocated NumPy array per column, doubled when
+    # full. The game calls end_round() when a round finishes, which flushes
+    # once at least flush_rows events have piled up.
+    def __init__(self, directory, layout, prefix=None, capacity=EVENT_BUFFER, flush_rows=1):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix or time.strftime("%Y%m%d-%H%M%S")
+        self.holes = np.array([layout.anchor(pos) for pos in layout.holes], dtype=np.int16).reshape(-1, 2)
+        self.flush_rows = flush_rows
+        self.columns = {name: np.empty(capacity, dtype) for name, dtype in COLUMNS.items()}
+        self.count = 0
+        self.round = 0
+        self.files = 0
+
+    def spawn(self, t, hole, color):
+        self.add(SPAWN, t, hole, color)
+
+    def click(self, t, pos, hole=None, color=None, reaction=np.nan):
+        if hole is None:
+            self.add(CLICK, t, pos=pos)
+        else:
+            self.add(CLICK, t, hole, color, pos, reaction)
+
+    def miss(self, t, hole, color):
+        self.add(MISS, t, hole, color)
+
+    def add(self, kind, t, hole=-1, color=None, pos=(-1, -1), reaction=np.nan):
+        i = self.count
+        if i == len(self.columns['kind']):
+            self.grow()
+        columns = self.columns
+        columns['kind'][i] = kind
+        columns['round'][i] = self.round
+        columns['t'][i] = t
+        columns['hole'][i] = hole
+        columns['color'][i] = -1 if color is None else COLORS.index(color)
+        columns['x'][i], columns['y'][i] = pos
+        columns['reaction'][i] = reaction
+        self.count = i + 1
+
+    def grow(self):
+        for name, column in self.columns.items():
+            bigger = np.empty(2 * len(column), column.dtype)
+            bigger[:self.count] = column[:self.count]
+            self.columns[name] = bigger
+
+    def begin_round(self):
+        self.round += 1
+
+    def end_round(self):
+        if self.count >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        # Write buffered events to a new file and empty the buffer; returns the path
+        if not self.count:
+            return None
+        path = os.path.join(self.directory, f"{self.prefix}-{self.files:04d}.npz")
+        np.savez_compressed(path, holes=self.holes,
+                            **{name: column[:self.count] for name, column in self.columns.items()})
+        self.files += 1
+        self.count = 0
+        return path
@@ -1,26 +1,63 @@
-import pygame, sys, random
+import pygame, sys, time, argparse
 from pygame.locals import *
 
-from constants import WIDTH, HEIGHT, WHITE, BLACK, FPS
-from sprites.zombie import Zombie
+from constants import WIDTH, HEIGHT, WHITE, BLACK, FPS, ENGINE, IDLE_WAIT, LOADING_WAIT
+from constants import WINDOW_SCALE, RENDER_SCALE, STATS_DB
+from constants import SPAWN_INTERVAL, WAVE_SIZE, IDLE_DURATION, RED_RATIO, AUDIO_FREQUENCY, AUDIO_BUFFER
+from sprites.zombie import ZombiePool
 from game_state import GameState
 from ui import GameUI
+from simulation import FixedTimestep, GameClock
+from scheduler import Scheduler
+from board import BoardLayout, HoleIndex
+from profiler import FrameProfiler
+from audio import AudioSystem
+from stats import StatsStore, HIT, MISS
+from resolution import AutoResolution
 from assets import *
 
+pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
 pygame.init()
 pygame.mixer.init()
 
 class WhackAZombie:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    def __init__(self, layout=None, engine=ENGINE, music=True, seed=None, clock=None, window_scale=WINDOW_SCALE):
+        # Gameplay and menus work in WIDTH x HEIGHT; the window may be scaled
+        self.window_scale = window_scale
+        self.screen = pygame.display.set_mode((round(WIDTH * window_scale), round(HEIGHT * window_scale)))
         pygame.display.set_caption("Whack a Zombie")
-        self.clock = pygame.time.Clock()
+        self.clock = clock or GameClock() # Replays pass a ManualClock
+        self.timestep = FixedTimestep()
+        self.scheduler = Scheduler() # Gameplay deadlines, counted in simulation steps
+        self.profiler = FrameProfiler() # Disabled (no-op) until turned on
+        self.recorder = None # replay.SessionRecorder when recording
+        self.stats = None # stats.StatsStore when play statistics are kept
+        self.round = None # Round number in stats of the current (or just finished) round
+        self.events = None # eventlog.EventRecorder when recording events for analysis.py
+
+        self.game_state = GameState(seed)
+
+        # Hole positions and sprite sizes
+        self.layout = layout or BoardLayout.classic()
+        self.holes = self.layout.holes
+        self.hole_index = HoleIndex(self.layout)
+        self.spawned = [0.0] * len(self.holes) # Sim time each hole's zombie appeared, for reaction times
+        self.engine = engine
+
+        # Decode assets in the background; the intro background comes first so
+        # the intro screen can show up while the rest is still loading
+        self.loader = BackgroundLoader()
+        for name, (path, size) in IMAGES.items():
+            if name == 'hole':
+                size = self.layout.hole_size # Holes scale with the board
+            self.loader.submit(name, AssetLoader.load_scaled, path, size)
+        for color in ZOMBIE_COLORS:
+            self.loader.submit(color, AssetLoader.decode_zombie_frames, color, self.layout.zombie_size)
+        self.loader.submit('hit_sounds', AssetLoader.load_hit_sounds)
+        self.assets_ready = False
 
-        self.game_state = GameState()
-
-        # Load assets
         self.images = {
-            **AssetLoader.load_images()
+            'intro_bg': AssetLoader.to_display(self.loader.result('intro_bg'))
         }
 
         # Fonts
@@ -28,7 +65,9 @@ class WhackAZombie:
             **AssetLoader.load_fonts()
         }
 
-        self.ui = GameUI(self.screen, self.fonts, self.images)
+        self.ui = GameUI(self.screen, self.fonts, self.images, clock=self.clock)
+        self.auto_resolution = None # AutoResolution in automatic render scale mode
+        self.set_render_scale(RENDER_SCALE)
 
         # Hammer state for UI
         self.hammer_state = {
@@ -38,52 +77,143 @@ class WhackAZombie:
             'cursor_visible': True # Initial state, will be set by run loop
         }
 
-        # Hole positions
-        self.holes = [(125, 450), (450, 450), (775, 450),
-                      (125, 650), (450, 650), (775, 650)]
-
-        self.zombie_frames = {
-            "red": AssetLoader.load_zombie_frames("red"),
-            "green": AssetLoader.load_zombie_frames("green"),
-        }
-
-        self.zombies = [] # Zombies will be spawned dynamically
-
-        self.sound = AssetLoader.load_sounds()
+        self.atlas = None # Filled in by poll_assets
+        self.zombie_frames = {}
+        self.audio = AudioSystem() # Hit sounds are loaded by poll_assets
+        self.profiler.extra = self.audio.overlay_lines
+        self.input_time = None # perf_counter when this frame's input was read
+
+        self.pool = None # Preallocated zombies, created once frames are loaded
+        self.zombies = [] # Every pooled zombie, active or not
+        self.field = None # Array-backed zombies when engine == "arrays"
+        # Difficulty, see constants.py; simulate.py sweeps these
+        self.spawn_interval = SPAWN_INTERVAL
+        self.wave_size = WAVE_SIZE
+        self.idle_duration = IDLE_DURATION
+        self.red_ratio = RED_RATIO
+        self.schedule_wave()
+        self.drawn_state = None # State shown by the previous frame
+        self.fps = FPS # Frame cap during play; 0 runs uncapped
+
+        if music:
+            AssetLoader.start_music()
+
+    def poll_assets(self):
+        # Once every background job is done, finish the assets on the main thread
+        if self.assets_ready or not self.loader.done():
+            return
+        images = AssetLoader.finish_images({name: self.loader.result(name) for name in IMAGES})
+        frames = {color: AssetLoader.finish_zombie_frames(self.loader.result(color)) for color in ZOMBIE_COLORS}
+        # Sprites are drawn from a single atlas; images keeps the backgrounds
+        self.atlas, self.zombie_frames = AssetLoader.build_atlas(images, frames)
+        self.images.update(images)
+        self.ui.set_atlas(self.atlas)
+        self.audio.load(self.loader.result('hit_sounds'))
+        if self.engine == "arrays":
+            from zombie_engine import ZombieField
+            self.field = ZombieField(self.layout, self.zombie_frames, self.game_state, ("green", "red"))
+            self.field.on_miss = self.missed
+        else:
+            # At most one zombie per hole can be out at once
+            self.pool = ZombiePool(len(self.holes), self.zombie_frames["green"], self.layout, self.game_state,
+                                   self.scheduler, self.hole_index.release)
+            self.zombies = self.pool.zombies
+            self.pool.on_miss = lambda zombie: self.missed(self.hole_index.slots[zombie.current_hole], zombie.color)
+        self.loader.shutdown()
+        self.assets_ready = True
+
+    def wait_for_assets(self):
+        # Headless tools (benchmark, replay, simulate) have no loop to poll from
+        while not self.assets_ready:
+            self.poll_assets()
+            time.sleep(0.001)
+
+    def set_render_scale(self, render_scale):
+        # Internal resolution of the play field, as a fraction of the window's
+        self.render_scale = render_scale
+        scale = self.window_scale * render_scale
+        self.ui.set_render_scale(scale, self.fonts if scale == 1 else AssetLoader.load_fonts(scale))
+
+    def to_logical(self, event):
+        # Clicks in window pixels -> WIDTH x HEIGHT, where hit checks and buttons live
+        if event.type != MOUSEBUTTONDOWN or self.window_scale == 1:
+            return event
+        x, y = event.pos
+        return pygame.event.Event(event.type, {**event.dict,
+                                               'pos': (int(x / self.window_scale), int(y / self.window_scale))})
 
     def spawn_wave(self):
-        group_size = random.randint(1, 4)
-        available = [h for h in self.holes if h not in self.game_state.occupied_holes]
-        if len(available) < group_size:
-            group_size = len(available)
-
-        # Reuse existing zombies if possible
-        inactive_zombies = [z for z in self.zombies if not z.active]
-
-        while len(inactive_zombies) < group_size:
-            color = "red" if random.random() < 0.2 else "green"
-            z = Zombie(self.zombie_frames[color], self.holes, self.game_state, color)
-            self.zombies.append(z)
-            inactive_zombies.append(z)
+        # Waves grow with the board so large boards stay busy
+        rng = self.game_state.rng
+        group_size = rng.randint(*self.wave_size) * max(1, len(self.holes) // 6)
+        if self.field is not None:
+            free = self.field.free_slots().tolist()
+            slots = rng.sample(free, min(group_size, len(free)))
+            colors = [1 if rng.random() < self.red_ratio else 0 for _ in slots]
+            now = self.sim_time()
+            for slot, color in zip(slots, colors):
+                self.spawned[slot] = now
+                if self.events is not None:
+                    self.events.spawn(now, slot, self.field.colors[color])
+            self.field.idle_duration = self.idle_duration
+            self.field.spawn(slots, colors)
+            return
 
         for _ in range(group_size):
-            if not available:
+            pos = self.hole_index.random_free(rng)
+            if pos is None:
                 break
-            pos = random.choice(available)
-            available.remove(pos)
-
-            zombie = inactive_zombies.pop(0)
-            zombie.spawn()  # Use spawn method to set position and state
-            zombie.rect.midbottom = (pos[0] + 100, pos[1] + 120)
-            zombie.base_y = zombie.rect.bottom
-            zombie.target_y = zombie.base_y - 40
-            zombie.rising = True
-            zombie.active = True
-            zombie.current_hole = pos
-            self.game_state.occupied_holes.add(pos)
-
-    def handle_events(self):
-        for event in pygame.event.get():
+            color = "red" if rng.random() < self.red_ratio else "green"
+
+            zombie = self.pool.spawn(pos, color, self.zombie_frames[color], self.idle_duration)
+            self.hole_index.occupy(zombie)
+            slot = self.hole_index.slots[pos]
+            self.spawned[slot] = self.sim_time()
+            if self.events is not None:
+                self.events.spawn(self.spawned[slot], slot, color)
+
+    def wave(self):
+        # Scheduler event: spawn a wave and queue the next one
+        self.profiler.mark("update")
+        self.spawn_wave()
+        self.profiler.mark("spawn")
+        self.schedule_wave()
+
+    def schedule_wave(self):
+        self.scheduler.after(self.spawn_interval, self.wave)
+
+    def sim_time(self):
+        # ms of gameplay simulated so far
+        return self.scheduler.now * self.scheduler.step_ms
+
+    def begin_round(self):
+        if self.stats is not None:
+            # GameState.rng is seeded once per session, so the seed only reproduces the first round
+            seed = self.game_state.seed if self.round is None else None
+            self.round = self.stats.begin_round(seed, self.engine, len(self.holes))
+        if self.events is not None:
+            self.events.begin_round()
+
+    def end_round(self, completed):
+        # Rounds left from the pause menu are kept, but not ranked
+        if self.stats is not None and self.round is not None:
+            self.stats.end_round(self.round, self.game_state, completed)
+        if self.events is not None:
+            self.events.end_round()
+
+    def missed(self, slot, color):
+        # A zombie sank back unhit
+        if self.stats is not None:
+            self.stats.event(self.round, MISS, self.sim_time(), slot, color)
+        if self.events is not None:
+            self.events.miss(self.sim_time(), slot, color)
+
+    def handle_events(self, events=None):
+        clicks = [] # Hammer hits queued this frame, resolved together below
+
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == QUIT:
                 pygame.quit()
                 sys.exit()
@@ -91,10 +221,12 @@ class WhackAZombie:
             if event.type == KEYDOWN and event.key == K_p:
                 if self.game_state.state == "play":
                     self.game_state.state = "pause"
-                    self.game_state.time_left = self.game_state.time_limit - (pygame.time.get_ticks() - self.game_state.start_time)
                 elif self.game_state.state == "pause":
-                    self.game_state.start_time = pygame.time.get_ticks() - (self.game_state.time_limit - self.game_state.time_left)
                     self.game_state.state = "play"
+                    self.timestep.reset()
+
+            if event.type == KEYDOWN and event.key == K_F3:
+                self.profiler.toggle_overlay()
 
             if event.type == KEYDOWN and event.key == K_m:
                 if self.game_state.sound_enabled:
@@ -108,58 +240,116 @@ class WhackAZombie:
 
             if self.game_state.state == "intro":
                 if event.type == MOUSEBUTTONDOWN and event.button == 1:
-                    if 'start' in button_rects and button_rects['start'].collidepoint(event.pos):
+                    # START stays disabled until every gameplay asset is ready
+                    if self.assets_ready and 'start' in button_rects and button_rects['start'].collidepoint(event.pos):
                         self.game_state.state = "play"
-                        self.game_state.start_time = pygame.time.get_ticks()
                         self.game_state.time_left = self.game_state.time_limit
+                        self.timestep.reset()
+                        self.begin_round()
 
             elif self.game_state.state == "play":
-                if event.type == MOUSEBUTTONDOWN and event.button == 1:
+                # Touches also arrive as emulated mouse clicks; only count them once
+                if event.type == MOUSEBUTTONDOWN and event.button == 1 and not getattr(event, 'touch', False):
                     self.hammer_state['hammer_swing'] = True
-                    self.hammer_state['hammer_swing_start'] = pygame.time.get_ticks()
-                    for zombie in self.zombies:
-                        if zombie.check_hit(event.pos):
-                            self.sound.play()
-                            if zombie.color == "red":
-                                self.game_state.score += 2
-                            else:
-                                self.game_state.score += 1
-                            self.game_state.hits += 1
-                            break
+                    self.hammer_state['hammer_swing_start'] = self.clock.get_ticks()
+                    clicks.append(event.pos)
+                elif event.type == FINGERDOWN:
+                    clicks.append((int(event.x * WIDTH), int(event.y * HEIGHT)))
 
             elif self.game_state.state == "pause":
                 if event.type == MOUSEBUTTONDOWN and event.button == 1:
                     if 'continue' in button_rects and button_rects['continue'].collidepoint(event.pos):
                         # Resume
-                        self.game_state.start_time = pygame.time.get_ticks() - (self.game_state.time_limit - self.game_state.time_left)
                         self.game_state.state = "play"
+                        self.timestep.reset()
                     elif 'pause_intro' in button_rects and button_rects['pause_intro'].collidepoint(event.pos):
                         # Reset to intro
+                        self.end_round(False)
                         self.game_state.reset()
-                        self.zombies.clear()
-                        self.game_state.occupied_holes.clear()
+                        self.clear_zombies()
                         self.game_state.state = "intro"
 
             elif self.game_state.state == "timesup":
                 if event.type == MOUSEBUTTONDOWN and event.button == 1:
                     if 'play_again' in button_rects and button_rects['play_again'].collidepoint(event.pos):
                         self.game_state.reset()
-                        self.zombies.clear()
-                        self.game_state.occupied_holes.clear()
-                        self.game_state.start_time = pygame.time.get_ticks()
+                        self.clear_zombies()
                         self.game_state.time_left = self.game_state.time_limit
                         self.game_state.state = "play"
+                        self.timestep.reset()
+                        self.begin_round()
                         self.spawn_wave()
                     elif 'intro' in button_rects and button_rects['intro'].collidepoint(event.pos):
                         self.game_state.reset()
-                        self.zombies.clear()
-                        self.game_state.occupied_holes.clear()
+                        self.clear_zombies()
                         self.game_state.state = "intro"
 
-    def run(self):
-        spawn_timer = 0
-        spawn_interval = 2000
+        if clicks:
+            self.resolve_clicks(clicks)
+
+    def resolve_clicks(self, clicks):
+        # Each click only checks the holes its grid cell can reach, topmost first
+        for pos in clicks:
+            color = None
+            if self.field is not None:
+                slot = self.field.hit(pos, self.hole_index.candidates(pos))
+                if slot is not None:
+                    color = self.field.colors[self.field.color[slot]]
+            else:
+                zombie = self.hole_index.hit(pos)
+                if zombie is not None:
+                    slot = self.hole_index.slots[zombie.current_hole]
+                    color = zombie.color
+                    self.pool.hit(zombie)
+            if color is None:
+                if self.events is not None:
+                    self.events.click(self.sim_time(), pos)
+            else:
+                now = self.sim_time()
+                reaction = now - self.spawned[slot]
+                if self.stats is not None:
+                    self.stats.event(self.round, HIT, now, slot, color, reaction)
+                if self.events is not None:
+                    self.events.click(now, pos, slot, color, reaction)
+                self.audio.play(color, self.input_time)
+                if color == "red":
+                    self.game_state.score += 2
+                else:
+                    self.game_state.score += 1
+                self.game_state.hits += 1
+
+    def clear_zombies(self):
+        # Also restarts the wave timer, as every caller is starting over
+        self.scheduler.clear()
+        self.hole_index.clear()
+        if self.pool is not None:
+            self.pool.reset()
+        if self.field is not None:
+            self.field.clear()
+        self.schedule_wave()
+
+    def step(self, dt):
+        # One fixed simulation step; everything gameplay-related advances here
+        if self.game_state.state != "play":
+            return
+
+        self.game_state.time_left = max(0, self.game_state.time_left - dt)
+        if self.game_state.time_left == 0:
+            # The round is over: nothing moves, sinks or spawns after its result is taken
+            self.game_state.state = "timesup"
+            self.end_round(True)
+            return
+
+        # Move what is moving, then run whatever falls due this step (zombie
+        # lifecycle changes, the next wave)
+        if self.field is not None:
+            self.field.step(dt)
+        else:
+            self.pool.step(dt)
+        self.scheduler.advance()
+        self.profiler.mark("update")
 
+    def run(self):
         # Hide system cursor at start if mouse is inside window
         if pygame.mouse.get_focused():
             pygame.mouse.set_visible(False)
@@ -169,49 +359,161 @@ class WhackAZombie:
             self.hammer_state['cursor_visible'] = True
 
         while True:
-            dt = self.clock.tick(FPS)
-            self.handle_events()
-
-            if self.game_state.state == "intro":
-                pygame.mouse.set_visible(True)
-                self.hammer_state['cursor_visible'] = True
-                self.ui.draw_intro()
-            elif self.game_state.state == "play":
-                pygame.mouse.set_visible(False) 
-                self.hammer_state['cursor_visible'] = False
-                
-                elapsed = pygame.time.get_ticks() - self.game_state.start_time
-                self.game_state.time_left = max(0, self.game_state.time_limit - elapsed)
-                
-                if self.game_state.time_left == 0:
-                    self.game_state.state = "timesup"
-                
-                for zombie in self.zombies:
-                    zombie.update(dt)
-                # Filter out inactive zombies and update occupied_holes
-                self.zombies = [z for z in self.zombies if z.active or z.rising or z.falling]
-                self.game_state.occupied_holes = {z.current_hole for z in self.zombies if hasattr(z, 'current_hole') and z.active}
-
-
-                spawn_timer += dt
-                if spawn_timer >= spawn_interval:
-                    self.spawn_wave()
-                    spawn_timer = 0
-                
-                self.ui.draw_play(self.game_state, self.holes, self.zombies, self.hammer_state)
-            elif self.game_state.state == "timesup":
-                pygame.mouse.set_visible(True) 
-                self.hammer_state['cursor_visible'] = True
-                self.ui.draw_timesup(self.game_state)
-            elif self.game_state.state == "pause":
-                pygame.mouse.set_visible(True)
-                self.hammer_state['cursor_visible'] = True
-                self.screen.blit(self.images['game_bg'], (0, 0)) # Draw background under pause overlay
-                self.ui.draw_pause()
+            if self.idle():
+                # Nothing on screen moves: sleep until input arrives. The timeout
+                # keeps the loading bar (and anything else polled) ticking over.
+                event = pygame.event.wait(IDLE_WAIT if self.assets_ready else LOADING_WAIT)
+                input_time = time.perf_counter()
+                events = [] if event.type == NOEVENT else [event] + pygame.event.get()
+                # Time spent asleep is not play time: the frame that leaves the
+                # screen (START, Continue, P) must not catch up on it
+                self.clock.tick()
+                dt = 0
+                if self.assets_ready and all(event.type == MOUSEMOTION for event in events):
+                    continue # The pointer moving over a static screen changes nothing
+            else:
+                # Sleep off the frame cap first, so input is read as late as possible
+                dt = self.clock.tick(self.fps)
+                events = pygame.event.get()
+                input_time = time.perf_counter()
+            # A stall of over a second (window dragged, debugger) counts as one second
+            self.frame(min(dt, 1000), events, input_time)
+
+    def idle(self):
+        # Menus and pause are static once drawn (the profiler overlay is not)
+        state = self.game_state.state
+        return state != "play" and state == self.drawn_state and not self.profiler.show_overlay
+
+    def frame(self, dt, events, input_time=None):
+        # One pass of the main loop: dt ms since the last frame plus this frame's
+        # input, read at perf_counter time input_time (now, if not given)
+        start = time.perf_counter()
+        self.input_time = input_time if input_time is not None else start
+        self.profiler.begin_frame()
+        self.poll_assets()
+        events = [self.to_logical(event) for event in events]
+        if self.recorder is not None and self.assets_ready:
+            # Recording starts once START can be pressed, so replays never race the loader
+            self.recorder.record(dt, events)
+        self.handle_events(events)
+        self.profiler.mark("events")
+        dirty = None
+
+        state = self.game_state.state
+        zombies = self.field if self.field is not None else self.hole_index.occupants
+        if state in ("pause", "timesup") and self.drawn_state == "play":
+            # Keep the board as it was left to show under the menu
+            self.ui.capture_play(self.game_state, self.holes, zombies, self.timestep.alpha)
+        # Static screens only go to the display when something may have changed;
+        # mouse motion alone changes nothing outside play
+        changed = (state != self.drawn_state or self.profiler.show_overlay
+                   or any(event.type != MOUSEMOTION for event in events))
+        self.drawn_state = state
+
+        if state == "intro":
+            pygame.mouse.set_visible(True)
+            self.hammer_state['cursor_visible'] = True
+            changed |= self.ui.draw_intro(None if self.assets_ready else self.loader.progress())
+        elif state == "play":
+            pygame.mouse.set_visible(False) 
+            self.hammer_state['cursor_visible'] = False
 
+            # Gameplay advances in fixed steps; rendering interpolates between them
+            self.timestep.advance(dt, self.step)
+            dirty = self.ui.draw_play(self.game_state, self.holes, zombies,
+                                      self.hammer_state, self.timestep.alpha)
+        elif state == "timesup":
+            pygame.mouse.set_visible(True) 
+            self.hammer_state['cursor_visible'] = True
+            summary = self.stats.summary(self.round) if self.stats is not None else None
+            changed |= self.ui.draw_timesup(self.game_state, summary)
+        elif state == "pause":
+            pygame.mouse.set_visible(True)
+            self.hammer_state['cursor_visible'] = True
+            changed |= self.ui.draw_pause()
+
+        overlay = self.profiler.draw(self.screen, self.fonts['mono'], self.clock.get_ticks())
+        if overlay is not None:
+            self.ui.add_overlay(overlay)
+            if dirty is not None:
+                dirty.append(overlay)
+        self.profiler.mark("draw")
+
+        if dirty is not None:
+            pygame.display.update(dirty)
+        elif state == "play" or changed:
             pygame.display.update()
+        self.profiler.mark("display")
+        self.profiler.end_frame()
+
+        if self.auto_resolution is not None and state == "play":
+            scale = self.auto_resolution.sample((time.perf_counter() - start) * 1000)
+            if scale is not None:
+                self.set_render_scale(scale)
+
+
+def render_scale(text):
+    return text if text == "auto" else float(text)
+
+
+def board_size(text):
+    rows, _, cols = text.lower().partition("x")
+    return int(rows), int(cols)
 
 
 if __name__ == "__main__":
-    game = WhackAZombie()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Whack a Zombie")
+    parser.add_argument("--board", type=board_size, metavar="ROWSxCOLS",
+                        help="generate a ROWSxCOLS hole grid instead of the classic 2x3 board")
+    parser.add_argument("--engine", choices=("objects", "arrays"), default=ENGINE,
+                        help="zombie engine; 'arrays' (NumPy) scales to very large boards")
+    parser.add_argument("--profile", action="store_true",
+                        help="record per-phase frame timings from the start (F3 shows them)")
+    parser.add_argument("--profile-dump", metavar="PATH",
+                        help="write recorded frame timings to PATH on exit (.csv or .json); implies --profile")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help=f"frame cap during play, 0 for uncapped (default {FPS})")
+    parser.add_argument("--window-scale", type=float, default=WINDOW_SCALE,
+                        help=f"window size relative to {WIDTH}x{HEIGHT} (default {WINDOW_SCALE})")
+    parser.add_argument("--render-scale", type=render_scale, default=RENDER_SCALE, metavar="SCALE|auto",
+                        help="play field resolution relative to the window, e.g. 0.5; "
+                             "'auto' lowers it while frames run over budget")
+    parser.add_argument("--stats", default=STATS_DB, metavar="PATH",
+                        help=f"SQLite database play statistics are saved to (default {STATS_DB})")
+    parser.add_argument("--no-stats", action="store_true", help="do not save play statistics")
+    parser.add_argument("--events", metavar="DIR",
+                        help="record spawns, clicks and misses to .npz files in DIR for analysis.py")
+    parser.add_argument("--seed", type=int, help="seed for zombie spawns (random by default)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record input and frame timing to PATH for replay.py")
+    args = parser.parse_args()
+
+    layout = BoardLayout.grid(*args.board) if args.board else None
+    game = WhackAZombie(layout, args.engine, seed=args.seed, window_scale=args.window_scale)
+    game.fps = args.fps
+    if args.render_scale == "auto":
+        game.auto_resolution = AutoResolution(args.fps)
+        game.set_render_scale(game.auto_resolution.scale)
+    else:
+        game.set_render_scale(args.render_scale)
+    if args.profile or args.profile_dump:
+        game.profiler.set_enabled(True)
+    if not args.no_stats:
+        game.stats = StatsStore(args.stats)
+    if args.events:
+        from eventlog import EventRecorder
+        game.events = EventRecorder(args.events, game.layout)
+    if args.record:
+        from replay import SessionRecorder
+        game.recorder = SessionRecorder(args.record, game.game_state.seed, args.engine, args.board)
+    try:
+        game.run()
+    finally:
+        if args.profile_dump:
+            game.profiler.dump(args.profile_dump)
+        if game.recorder is not None:
+            game.recorder.close(game.game_state)
+        if game.stats is not None:
+            game.stats.close()
+        if game.events is not None:
+            game.events.flush()
\ No newline at end of file
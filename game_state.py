@@ -1,5 +1,12 @@
+import random
+
 class GameState:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # Every gameplay random draw comes from this generator, so a session
+        # replays exactly given its seed and its input
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+
         # Game state
         self.state = "intro"
         self.score = 0
@@ -7,15 +14,11 @@ class GameState:
         self.misses = 0
         self.time_limit = 30_000  
         self.time_left = self.time_limit
-        self.start_time = None
         self.sound_enabled = True
-        self.occupied_holes = set() 
 
     def reset(self):
         self.score = 0
         self.hits = 0
         self.misses = 0
         self.time_left = self.time_limit
-        self.start_time = None
-        self.state = "intro"
-        self.occupied_holes.clear() 
\ No newline at end of file
+        self.state = "intro"
\ No newline at end of file
@@ -0,0 +1,120 @@
+import csv
+import json
+import time
+from array import array
+
+import pygame
+from constants import PROFILE_FRAMES, WHITE
+
+PHASES = ("events", "update", "spawn", "draw", "display")
+
+def _noop(*args):
+    pass
+
+
+class FrameProfiler:
+    # Per-phase frame timings in a fixed-size ring buffer. The game calls
+    # begin_frame(), then mark(phase) after each phase, then end_frame(); mark
+    # charges the time since the previous mark to that phase. While disabled
+    # those three are bound to a no-op, so the calls can stay in production.
+    def __init__(self, phases=PHASES, size=PROFILE_FRAMES, enabled=False):
+        self.phases = phases
+        self.size = size
+        self.samples = {phase: array('d', bytes(8 * size)) for phase in phases + ("total",)}
+        self.current = dict.fromkeys(phases, 0.0)
+        self.frames = 0  # frames recorded so far (the ring holds the last `size`)
+        self.last = 0.0
+        self.frame_start = 0.0
+
+        self.overlay = None
+        self.overlay_time = 0
+        self.extra = None  # optional callable returning more overlay lines
+        self.show_overlay = False
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.begin_frame = self._begin_frame
+            self.mark = self._mark
+            self.end_frame = self._end_frame
+        else:
+            self.begin_frame = self.mark = self.end_frame = _noop
+
+    def toggle_overlay(self):
+        # The overlay needs data, so showing it also turns recording on
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay and not self.enabled:
+            self.set_enabled(True)
+        self.overlay = None
+
+    def _begin_frame(self):
+        self.frame_start = self.last = time.perf_counter()
+
+    def _mark(self, phase):
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def _end_frame(self):
+        i = self.frames % self.size
+        for phase in self.phases:
+            self.samples[phase][i] = self.current[phase] * 1000
+            self.current[phase] = 0.0
+        self.samples["total"][i] = (self.last - self.frame_start) * 1000
+        self.frames += 1
+
+    def recorded(self, phase):
+        # Samples for phase in ms, oldest first
+        data = self.samples[phase]
+        n = min(self.frames, self.size)
+        start = self.frames % self.size if self.frames > self.size else 0
+        return [data[(start + k) % self.size] for k in range(n)]
+
+    def percentiles(self, phase, qs=(50, 95, 99)):
+        data = sorted(self.recorded(phase))
+        if not data:
+            return [0.0 for _ in qs]
+        return [data[min(len(data) - 1, len(data) * q // 100)] for q in qs]
+
+    def draw(self, screen, font, now):
+        # Draw the p50/p95/p99 table; returns the rect drawn, or None when hidden
+        if not self.show_overlay:
+            return None
+        if self.overlay is None or now - self.overlay_time >= 250:
+            self.overlay = self.render_overlay(font)
+            self.overlay_time = now
+        return screen.blit(self.overlay, (10, screen.get_height() - self.overlay.get_height() - 10))
+
+    def render_overlay(self, font):
+        lines = [f"{'phase':<8}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for phase in self.phases + ("total",):
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append(f"{phase:<8}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        if self.extra is not None:
+            lines.extend(self.extra())
+        rendered = [font.render(line, True, WHITE) for line in lines]
+        width = max(r.get_width() for r in rendered) + 16
+        height = sum(r.get_height() for r in rendered) + 16
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 190))
+        y = 8
+        for r in rendered:
+            overlay.blit(r, (8, y))
+            y += r.get_height()
+        return overlay
+
+    def dump(self, path):
+        # Write the recorded frames to CSV, or JSON if path ends in .json
+        columns = self.phases + ("total",)
+        data = {phase: self.recorded(phase) for phase in columns}
+        if path.endswith(".json"):
+            summary = {phase: dict(zip(("p50", "p95", "p99"), self.percentiles(phase))) for phase in columns}
+            with open(path, "w") as f:
+                json.dump({'frames': len(data["total"]), 'ms': data, 'percentiles': summary}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + columns)
+                for k in range(len(data["total"])):
+                    writer.writerow([k] + [f"{data[phase][k]:.4f}" for phase in columns])
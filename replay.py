@@ -0,0 +1,155 @@
+import argparse, os, struct, sys, time
+import pygame
+
+# Session log: a header, then one record per frame (dt in ms plus the frame's
+# input events), then an end marker with the final score, hits and misses.
+#   header: b"ZAYR", version, seed, engine (0 objects / 1 arrays), board rows, cols (0, 0 = classic)
+#   frame:  dt, event count, then each event as a type byte plus its payload
+# Only the events the game reacts to are stored; everything else is derived
+# from the seed, so replaying the log reproduces the session exactly.
+VERSION = 3  # bumped whenever gameplay timing changes, as old logs no longer replay
+HEADER = struct.Struct("<4sHQBHH")
+FRAME = struct.Struct("<HH")
+FINAL = struct.Struct("<iii")
+END_MARK = 0xFFFF
+ENGINES = ("objects", "arrays")
+
+# Event type byte -> payload layout
+QUIT_EVENT, KEY_EVENT, CLICK_EVENT, FINGER_EVENT = range(4)
+KEY = struct.Struct("<i")  # key
+CLICK = struct.Struct("<Bhh?")  # button, x, y, touch
+FINGER = struct.Struct("<dd")  # normalized x, y (doubles, so pixel rounding replays exactly)
+
+def encode_event(event):
+    # Bytes for one event, or None for events the game ignores
+    if event.type == pygame.QUIT:
+        return bytes((QUIT_EVENT,))
+    if event.type == pygame.KEYDOWN:
+        return bytes((KEY_EVENT,)) + KEY.pack(event.key)
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        x, y = event.pos
+        return bytes((CLICK_EVENT,)) + CLICK.pack(event.button, x, y, getattr(event, 'touch', False))
+    if event.type == pygame.FINGERDOWN:
+        return bytes((FINGER_EVENT,)) + FINGER.pack(event.x, event.y)
+    return None
+
+
+class SessionRecorder:
+    def __init__(self, path, seed, engine, board=None):
+        rows, cols = board or (0, 0)
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(b"ZAYR", VERSION, seed, ENGINES.index(engine), rows, cols))
+        self.frames = 0
+
+    def record(self, dt, events):
+        encoded = [data for data in map(encode_event, events) if data is not None]
+        self.file.write(FRAME.pack(dt, len(encoded)))
+        self.file.write(b"".join(encoded))
+        self.frames += 1
+
+    def close(self, game_state):
+        if self.file.closed:
+            return
+        self.file.write(FRAME.pack(END_MARK, 0))
+        self.file.write(FINAL.pack(game_state.score, game_state.hits, game_state.misses))
+        self.file.close()
+
+
+class SessionLog:
+    def __init__(self, seed, engine, board, frames, final):
+        self.seed = seed
+        self.engine = engine
+        self.board = board  # (rows, cols) or None for the classic board
+        self.frames = frames  # [(dt, [pygame events])]
+        self.final = final  # (score, hits, misses), or None if the recording was cut short
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, engine, rows, cols = HEADER.unpack_from(data)
+        if magic != b"ZAYR" or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} session log")
+
+        frames = []
+        final = None
+        offset = HEADER.size
+        while offset + FRAME.size <= len(data):
+            dt, count = FRAME.unpack_from(data, offset)
+            offset += FRAME.size
+            if dt == END_MARK:
+                final = FINAL.unpack_from(data, offset)
+                break
+            events = []
+            for _ in range(count):
+                kind = data[offset]
+                offset += 1
+                if kind == QUIT_EVENT:
+                    events.append(pygame.event.Event(pygame.QUIT))
+                elif kind == KEY_EVENT:
+                    (key,) = KEY.unpack_from(data, offset)
+                    offset += KEY.size
+                    events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+                elif kind == CLICK_EVENT:
+                    button, x, y, touch = CLICK.unpack_from(data, offset)
+                    offset += CLICK.size
+                    events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(x, y), touch=touch))
+                elif kind == FINGER_EVENT:
+                    x, y = FINGER.unpack_from(data, offset)
+                    offset += FINGER.size
+                    events.append(pygame.event.Event(pygame.FINGERDOWN, x=x, y=y))
+                else:
+                    raise ValueError(f"{path}: unknown event type {kind} at byte {offset - 1}")
+            frames.append((dt, events))
+        return SessionLog(seed, ENGINES[engine], (rows, cols) if rows else None, frames, final)
+
+
+def replay(log):
+    # Re-run a session headless as fast as possible; returns (score, hits, misses, sim ms)
+    from board import BoardLayout
+    from game import WhackAZombie
+    from simulation import ManualClock
+
+    clock = ManualClock()
+    layout = BoardLayout.grid(*log.board) if log.board else None
+    game = WhackAZombie(layout, log.engine, music=False, seed=log.seed, clock=clock)
+    game.wait_for_assets()
+
+    for dt, events in log.frames:
+        if any(event.type == pygame.QUIT for event in events):
+            break # The session ended here
+        clock.advance(dt)
+        game.frame(dt, events)
+    state = game.game_state
+    return state.score, state.hits, state.misses, clock.get_ticks()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Whack a Zombie session headless")
+    parser.add_argument("log", help="session log written by game.py --record")
+    args = parser.parse_args()
+
+    # Headless: SDL's dummy drivers must be selected before the game initializes pygame
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    log = SessionLog.load(args.log)
+    start = time.perf_counter()
+    score, hits, misses, sim_ms = replay(log)
+    elapsed = time.perf_counter() - start
+    print(f"{len(log.frames)} frames, {sim_ms / 1000:.1f} s of play replayed in {elapsed:.2f} s "
+          f"({sim_ms / 1000 / max(elapsed, 1e-9):.0f}x)")
+    print(f"score {score}, hits {hits}, misses {misses}")
+
+    if log.final is None:
+        print("log has no final result (recording was cut short); nothing to verify")
+        return 0
+    if (score, hits, misses) != log.final:
+        print("MISMATCH: recorded score {}, hits {}, misses {}".format(*log.final))
+        return 1
+    print("OK: matches the recording")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
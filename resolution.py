@@ -0,0 +1,41 @@
+from constants import FPS, RENDER_SCALES, AUTO_RES_FRAMES
+
+class AutoResolution:
+    # Automatic render scale ("performance mode"). Play frames are timed from
+    # the start of frame() to the display update, so the frame cap's sleep is
+    # not counted. When the mean over a window of frames goes over budget the
+    # render scale steps down a level; it steps back up only when the frame,
+    # with its fill cost grown to the higher resolution, would still fit easily.
+    def __init__(self, fps=FPS, levels=RENDER_SCALES, frames=AUTO_RES_FRAMES, headroom=0.8):
+        self.budget = 1000 / (fps or FPS) * headroom  # ms
+        self.levels = levels
+        self.level = 0
+        self.frames = frames
+        self.total = 0.0
+        self.count = 0
+
+    @property
+    def scale(self):
+        return self.levels[self.level]
+
+    def sample(self, ms):
+        # Add one play frame's time; returns the new scale when it should change
+        self.total += ms
+        self.count += 1
+        if self.count < self.frames:
+            return None
+        mean = self.total / self.count
+        self.total = 0.0
+        self.count = 0
+
+        if mean > self.budget and self.level < len(self.levels) - 1:
+            self.level += 1
+            return self.scale
+        if self.level > 0:
+            # Pessimistic: as if the whole frame were fill, which grows with the pixel count
+            grown = mean * (self.levels[self.level - 1] / self.scale) ** 2
+            if grown < self.budget * 0.75:
+                self.level -= 1
+                return self.scale
+        return None
+
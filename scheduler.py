@@ -0,0 +1,47 @@
+import heapq
+import math
+
+from constants import SIM_STEP
+
+class Scheduler:
+    # Deadlines counted in fixed simulation steps, kept in a heap. Each step
+    # costs only the events that fall due, however many are pending.
+    # Cancelled events stay in the heap and are skipped when they come up.
+    def __init__(self, step_ms=SIM_STEP):
+        self.step_ms = step_ms
+        self.now = 0  # steps run so far
+        self.heap = []
+        self.seq = 0  # tie-break: events due on the same step run in scheduling order
+
+    def steps(self, ms):
+        # Whole steps covering ms (at least one)
+        return max(1, math.ceil(ms / self.step_ms - 1e-9))
+
+    def after(self, ms, callback, *args):
+        # Run callback(*args) ms from now (rounded up to a step); returns a handle
+        # for cancel, or None if ms is infinite (the event never happens)
+        if ms == math.inf:
+            return None
+        return self.after_steps(self.steps(ms), callback, *args)
+
+    def after_steps(self, steps, callback, *args):
+        self.seq += 1
+        event = [self.now + steps, self.seq, callback, args]
+        heapq.heappush(self.heap, event)
+        return event
+
+    def cancel(self, event):
+        if event is not None:
+            event[2] = None
+
+    def advance(self):
+        # Move one step forward and run everything due by then
+        self.now += 1
+        heap = self.heap
+        while heap and heap[0][0] <= self.now:
+            _, _, callback, args = heapq.heappop(heap)
+            if callback is not None:
+                callback(*args)
+
+    def clear(self):
+        self.heap.clear()
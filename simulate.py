@@ -0,0 +1,218 @@
+import os
+
+# Headless: SDL's dummy drivers must be selected before pygame initializes
+# (worker processes re-import this module, so this runs in each of them too)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, itertools, json, multiprocessing, random, statistics, sys, time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from constants import SIM_STEP, SPAWN_INTERVAL, WAVE_SIZE, IDLE_DURATION, RED_RATIO, EVENT_BUFFER
+
+# Batch simulator for difficulty tuning: plays thousands of seeded rounds with a
+# scripted player, spread over worker processes, and reports the score, hit
+# and miss distributions for each combination of parameters.
+#
+#   python simulate.py --rounds 2000 --spawn-interval 1500 2000 --red-ratio 0.2 0.3
+#
+# Rounds only run the simulation steps (nothing is drawn), and round i uses
+# seed --seed + i for every parameter set, so sets are compared on the same waves.
+
+class AutoPlayer:
+    # Scripted player: notices each zombie, reacts after reaction_time ms (give
+    # or take jitter), clicks one target at a time at most every click_interval
+    # ms, and lands a click on its target with probability accuracy
+    def __init__(self, game, reaction_time=400, jitter=100, accuracy=0.85, click_interval=250):
+        self.game = game
+        self.reaction_time = reaction_time
+        self.jitter = jitter
+        self.accuracy = accuracy
+        self.click_interval = click_interval
+
+        self.points = game.layout.aim_points()
+        self.miss_offset = game.layout.zombie_size[0]  # beside the zombie
+        self.rng = random.Random()
+        self.reset(0)
+
+    def reset(self, seed):
+        self.rng.seed(f"player-{seed}")
+        self.noticed = {}  # slot -> time the player is ready to click it
+        self.next_click = 0
+
+    def targets(self):
+        # Slots holding a zombie that can still be hit
+        game = self.game
+        if game.field is not None:
+            from zombie_engine import RISING, FALLING
+            phase = game.field.phase
+            return ((phase >= RISING) & (phase <= FALLING)).nonzero()[0].tolist()
+        return [slot for slot, zombie in enumerate(game.hole_index.occupants)
+                if zombie is not None and not zombie.hit]
+
+    def act(self, now):
+        targets = self.targets()
+        live = set(targets)
+        noticed = self.noticed
+        for slot in list(noticed):
+            if slot not in live:
+                del noticed[slot]
+        for slot in targets:
+            if slot not in noticed:
+                noticed[slot] = now + max(0, self.rng.gauss(self.reaction_time, self.jitter))
+
+        if now < self.next_click or not noticed:
+            return
+        slot = min(noticed, key=noticed.get)
+        if noticed[slot] > now:
+            return
+        del noticed[slot]
+        x, y = self.points[slot]
+        if self.rng.random() >= self.accuracy:
+            x += self.miss_offset
+        self.game.resolve_clicks([(x, y)])
+        self.next_click = now + self.click_interval
+
+
+def play_round(game, player, seed):
+    state = game.game_state
+    game.clear_zombies()
+    state.reset()
+    state.seed = seed
+    state.rng.seed(seed)
+    state.state = "play"
+    player.reset(seed)
+    game.begin_round()
+
+    now = 0
+    while state.state == "play":
+        game.step(SIM_STEP)
+        now += SIM_STEP
+        if state.state == "play": # No clicks once the round has ended
+            player.act(now)
+    return state.score, state.hits, state.misses
+
+
+_games = {}  # per worker process: (board, engine) -> WhackAZombie
+
+def run_batch(board, engine, params, seeds, events=None):
+    # Worker entry point: play one round per seed with params; returns [(score, hits, misses)].
+    # With events (a directory), each worker records its rounds' events there.
+    game = _games.get((board, engine))
+    if game is None:
+        from board import BoardLayout
+        from game import WhackAZombie
+        game = WhackAZombie(BoardLayout.grid(*board) if board else None, engine, music=False)
+        game.wait_for_assets()
+        _games[(board, engine)] = game
+        if events:
+            from eventlog import EventRecorder
+            # Rounds are short: write a file per EVENT_BUFFER rows or so, and at the end of each batch
+            game.events = EventRecorder(events, game.layout, f"sim-{os.getpid()}-{time.strftime('%H%M%S')}",
+                                        flush_rows=EVENT_BUFFER)
+
+    game.spawn_interval = params['spawn_interval']
+    game.wave_size = params['wave_size']
+    game.idle_duration = params['idle_duration']
+    game.red_ratio = params['red_ratio']
+    player = AutoPlayer(game, params['reaction_time'], params['jitter'], params['accuracy'])
+    results = [play_round(game, player, seed) for seed in seeds]
+    if game.events is not None:
+        game.events.flush() # Worker processes exit without running cleanup code
+    return results
+
+
+def summarize(values):
+    values = sorted(values)
+    n = len(values)
+    return {
+        'mean': statistics.fmean(values),
+        'sd': statistics.pstdev(values),
+        'p10': values[n * 10 // 100],
+        'p50': values[n // 2],
+        'p90': values[min(n - 1, n * 90 // 100)],
+        'histogram': dict(sorted(Counter(values).items())),
+    }
+
+
+def wave_size(text):
+    low, _, high = text.partition("-")
+    return int(low), int(high or low)
+
+
+def main():
+    from game import board_size
+
+    parser = argparse.ArgumentParser(description="Headless Whack a Zombie batch simulator")
+    parser.add_argument("--rounds", type=int, default=1000, help="rounds per parameter set")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first round")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (1 runs inline)")
+    parser.add_argument("--batch", type=int, default=50, help="rounds per worker task")
+    parser.add_argument("--board", type=board_size, metavar="ROWSxCOLS")
+    parser.add_argument("--engine", choices=("objects", "arrays"), default="objects")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    parser.add_argument("--events", metavar="DIR", help="record every round's events to DIR for analysis.py")
+    # Swept parameters: every combination of the values given is simulated
+    parser.add_argument("--spawn-interval", type=int, nargs="+", default=[SPAWN_INTERVAL], metavar="MS")
+    parser.add_argument("--wave-size", type=wave_size, nargs="+", default=[WAVE_SIZE], metavar="MIN-MAX")
+    parser.add_argument("--idle-duration", type=int, nargs="+", default=[IDLE_DURATION], metavar="MS")
+    parser.add_argument("--red-ratio", type=float, nargs="+", default=[RED_RATIO])
+    parser.add_argument("--reaction-time", type=int, nargs="+", default=[400], metavar="MS")
+    parser.add_argument("--jitter", type=int, nargs="+", default=[100], metavar="MS",
+                        help="standard deviation of the reaction time")
+    parser.add_argument("--accuracy", type=float, nargs="+", default=[0.85])
+    args = parser.parse_args()
+
+    names = ('spawn_interval', 'wave_size', 'idle_duration', 'red_ratio', 'reaction_time', 'jitter', 'accuracy')
+    sweeps = [getattr(args, name) for name in names]
+    param_sets = [dict(zip(names, values)) for values in itertools.product(*sweeps)]
+    seeds = range(args.seed, args.seed + args.rounds)
+    batches = [(i, seeds[k:k + args.batch]) for i in range(len(param_sets))
+               for k in range(0, args.rounds, args.batch)]
+    board = tuple(args.board) if args.board else None
+
+    start = time.perf_counter()
+    results = [[] for _ in param_sets]
+    if args.workers <= 1:
+        for i, batch in batches:
+            results[i].extend(run_batch(board, args.engine, param_sets[i], list(batch), args.events))
+    else:
+        # spawn: workers set up pygame from scratch instead of inheriting a forked SDL
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(args.workers, mp_context=context) as pool:
+            jobs = {pool.submit(run_batch, board, args.engine, param_sets[i], list(batch), args.events): i
+                    for i, batch in batches}
+            for job in as_completed(jobs):
+                results[jobs[job]].extend(job.result())
+    elapsed = time.perf_counter() - start
+
+    report = []
+    print(f"{'interval':>8}{'wave':>6}{'idle':>6}{'red':>5}{'react':>6}{'acc':>5}"
+          f"{'score':>8}{'sd':>6}{'p10':>5}{'p50':>5}{'p90':>5}{'hits':>7}{'misses':>7}")
+    for params, rounds in zip(param_sets, results):
+        scores, hits, misses = zip(*rounds)
+        entry = {
+            'params': params,
+            'rounds': len(rounds),
+            'score': summarize(scores),
+            'hits': summarize(hits),
+            'misses': summarize(misses),
+        }
+        report.append(entry)
+        score = entry['score']
+        print(f"{params['spawn_interval']:8}{'%d-%d' % params['wave_size']:>6}{params['idle_duration']:6}"
+              f"{params['red_ratio']:5.2f}{params['reaction_time']:6}{params['accuracy']:5.2f}"
+              f"{score['mean']:8.1f}{score['sd']:6.1f}{score['p10']:5}{score['p50']:5}{score['p90']:5}"
+              f"{entry['hits']['mean']:7.1f}{entry['misses']['mean']:7.1f}")
+
+    total = len(param_sets) * args.rounds
+    print(f"{total} rounds in {elapsed:.1f} s ({total / elapsed:.0f} rounds/s, {args.workers} workers)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import pygame
+from constants import SIM_STEP, MAX_SIM_STEPS
+
+class FixedTimestep:
+    def __init__(self, step=SIM_STEP, max_steps=MAX_SIM_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0
+
+    def reset(self):
+        # Drop any pending time, e.g. when (re)entering play
+        self.accumulator = 0
+
+    def advance(self, frame_dt, update):
+        # Run as many fixed steps as the elapsed frame time covers
+        self.accumulator += frame_dt
+        steps = 0
+        while self.accumulator >= self.step:
+            if steps == self.max_steps:
+                # Too far behind: give up on the backlog instead of spiralling
+                self.accumulator %= self.step
+                break
+            update(self.step)
+            self.accumulator -= self.step
+            steps += 1
+        return steps
+
+    @property
+    def alpha(self):
+        # How far we are between the last step and the next one (0..1)
+        return self.accumulator / self.step
+
+
+class GameClock:
+    # Wall-clock frame timing; everything that reads the time goes through a
+    # clock object so replays can substitute ManualClock
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+
+    def tick(self, fps=0):
+        return self.clock.tick(fps)
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class ManualClock:
+    # Virtual time that only moves when the frame loop says so
+    def __init__(self):
+        self.ticks = 0
+
+    def advance(self, dt):
+        self.ticks += dt
+
+    def get_ticks(self):
+        return self.ticks
@@ -1,129 +1,119 @@
+import math
+
 import pygame
-import random
 
 class Zombie:
-    def __init__(self, frames, holes, game_state, color):
-        self.frames = frames  # {"idle": [...], "dead": [...]}
-        self.holes = holes
+    # Zombies are pooled and numerous, so keep them compact
+    __slots__ = (
+        'frames', 'layout', 'game_state', 'color', 'current_hole',
+        'state', 'frame_index', 'area', 'rect', 'animation_speed',
+        'active', 'rising', 'falling', 'speed', 'base_y', 'target_y', 'y', 'prev_y',
+        'idle_duration', 'hit', 'alpha', 'fade_speed',
+        'event', 'animation_event',
+    )
+
+    def __init__(self, frames, layout, game_state, color):
+        self.frames = frames  # {"atlas": Surface, "idle": [...], "dead": [...], "fade": [[...] per dead frame]} of atlas rects
+        self.layout = layout  # board.BoardLayout
         self.game_state = game_state  
         self.color = color
+        self.current_hole = None
 
         self.state = "idle"
         self.frame_index = 0
-        self.image = self.frames[self.state][self.frame_index]
-        self.rect = self.image.get_rect()
+        self.area = self.frames[self.state][self.frame_index]  # current frame's rect in the atlas
+        self.rect = pygame.Rect(0, 0, self.area.width, self.area.height)
 
-        self.animation_timer = 0
         self.animation_speed = 200  
 
         self.active = False
         self.rising = False
         self.falling = False
-        self.speed = 5 
+        self.speed = 300  # pixels per second
         self.base_y = -50
         self.target_y = 0
-
-        self.idle_timer = 0
+        self.y = 0  # exact bottom position, rect.bottom is the rounded value
+        self.prev_y = 0  # bottom position at the previous step, for interpolation
         self.idle_duration = 1000
-        self.cooldown_timer = 0
-        self.cooldown_duration = random.randint(500, 1500)
+
+        # Pending scheduler events (see ZombiePool): the next lifecycle change and the next animation frame
+        self.event = None
+        self.animation_event = None
         self.reset()
 
         # For got-hit/fade-out
         self.hit = False
         self.alpha = 255
-        self.fade_speed = 10  # alpha decrease per frame when hit
+        self.fade_speed = 600  # alpha decrease per second when hit
 
     def reset(self):
         self.active = False
+        self.rising = False
+        self.falling = False
         self.rect.topleft = (-200, 200)
         self.hit = False
         self.alpha = 255
         self.state = "idle"
         self.frame_index = 0
-        self.image = self.frames[self.state][self.frame_index]
-
-    def spawn(self):
-        available = [h for h in self.holes if h not in self.game_state.occupied_holes]
-        if not available:
-            return
+        self.area = self.frames[self.state][self.frame_index]
+        self.event = None
+        self.animation_event = None
+
+    def spawn(self, pos, color=None, frames=None):
+        # Pooled zombies can change color on each spawn
+        if color is not None:
+            self.color = color
+            self.frames = frames
         self.active = True
-        pos = random.choice(available)
-        self.rect.midbottom = (pos[0] + 100, pos[1] + 120)
+        self.rect.midbottom = self.layout.anchor(pos)
+        self.y = self.prev_y = self.rect.bottom
 
         self.current_hole = pos
-        self.game_state.occupied_holes.add(pos)
 
         self.base_y = self.rect.bottom
-        self.target_y = self.base_y - 40
+        self.target_y = self.base_y - self.layout.rise
         self.rising = True
         self.falling = False
-        self.idle_timer = 0
 
         # Reset hit/fade state and animation
         self.hit = False
         self.alpha = 255
         self.state = "idle"
         self.frame_index = 0
-        self.image = self.frames[self.state][self.frame_index]
+        self.area = self.frames[self.state][self.frame_index]
+
+    def travel_steps(self, dt):
+        # Steps needed to rise from the hole to the top (or sink back)
+        return math.ceil((self.base_y - self.target_y) / (self.speed * dt / 1000) - 1e-9)
 
     def update(self, dt):
-        if not self.active:
-            self.cooldown_timer += dt
-            return
+        # dt is the fixed simulation step in ms. Only called while the zombie is
+        # moving (rising, falling or fading out); the pool schedules when that stops.
+        self.prev_y = self.y
+        if self.hit:
+            self.alpha = max(0, self.alpha - self.fade_speed * dt / 1000)
+        elif self.rising:
+            self.y = max(self.target_y, self.y - self.speed * dt / 1000)
+            self.rect.bottom = round(self.y)
+        elif self.falling:
+            self.y = min(self.base_y, self.y + self.speed * dt / 1000)
+            self.rect.bottom = round(self.y)
 
-        self.animation_timer += dt
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.frame_index = (self.frame_index + 1) % len(self.frames[self.state])
-            self.image = self.frames[self.state][self.frame_index]
+    def animate(self):
+        self.frame_index = (self.frame_index + 1) % len(self.frames[self.state])
+        self.area = self.frames[self.state][self.frame_index]
 
+    def sprite(self, interp=1.0):
+        # (atlas, position, area) for Surface.blits; only meaningful while active.
+        # interp blends between the last two simulation steps for smooth motion.
         if self.hit:
-            # Fade out
-            self.alpha -= self.fade_speed
-            if self.alpha <= 0:
-                self.alpha = 0
-                self.active = False
-                self.hit = False
-                if hasattr(self, "current_hole"):
-                    self.game_state.occupied_holes.discard(self.current_hole)
-            return
-
-        if self.rising:
-            if self.rect.bottom > self.target_y:
-                self.rect.bottom -= self.speed
-            else: 
-                self.rising = False
-                self.idle_timer = 0
-        elif not self.rising and not self.falling:
-            self.idle_timer += dt
-            if self.idle_timer >= self.idle_duration:
-                self.falling = True
-
-        elif self.falling:
-            if self.rect.bottom < self.base_y:
-                self.rect.bottom += self.speed
-            else:
-                self.falling = False
-                self.active = False 
-                if hasattr(self, "current_hole"):
-                    self.game_state.occupied_holes.discard(self.current_hole)
-                if not self.hit:
-                    self.game_state.misses += 1 # Update game_state.misses
-
-    def draw(self, screen):
-        if self.active:
-            img = self.image.copy()
-            if self.hit:
-                img.set_alpha(self.alpha)
-            screen.blit(img, self.rect)
-
-            # pygame.draw.rect(screen, (255, 0, 0), self.rect, 2)
-
-            # if hasattr(self, "current_hole"):
-            #     x, y = self.current_hole
-            #     pygame.draw.circle(screen, (0, 255, 0), (x, y), 5)
-            #     pygame.draw.circle(screen, (0, 0, 255), self.rect.midbottom, 5)
+            # Pre-baked alpha level of the current got-hit frame
+            fade = self.frames["fade"][self.frame_index]
+            area = fade[round(self.alpha * (len(fade) - 1) / 255)]
+        else:
+            area = self.area
+        y = self.prev_y + (self.y - self.prev_y) * interp
+        return (self.frames["atlas"], (self.rect.x, round(y) - self.rect.height), area)
 
     def check_hit(self, pos):
         if self.active and not self.hit and self.rect.collidepoint(pos):
@@ -132,4 +122,84 @@ class Zombie:
             self.hit = True
             self.alpha = 255
             return True
-        return False
\ No newline at end of file
+        return False
+
+class ZombiePool:
+    # Fixed set of zombies allocated up front; spawning pops one off the free list
+    # and a zombie goes back on it when it leaves its hole.
+    #
+    # Lifecycle changes (risen, done idling, sunk back, faded out) and animation
+    # frames are deadlines on the scheduler, so a step only touches the zombies
+    # that are moving plus those with an event due, not the whole pool.
+    def __init__(self, capacity, frames, layout, game_state, scheduler, on_leave, color="green"):
+        self.zombies = [Zombie(frames, layout, game_state, color) for _ in range(capacity)]
+        self.free = list(self.zombies)
+        self.game_state = game_state
+        self.scheduler = scheduler
+        self.on_leave = on_leave  # called with each zombie that leaves its hole
+        self.on_miss = None  # called with each zombie that sinks back unhit
+        self.moving = {}  # zombies rising, falling or fading (a dict keeps the order deterministic)
+
+    def acquire(self):
+        return self.free.pop() if self.free else None
+
+    def release(self, zombie):
+        self.free.append(zombie)
+
+    def reset(self):
+        # Events are dropped along with the scheduler's queue by the caller
+        self.free.clear()
+        self.moving.clear()
+        for zombie in self.zombies:
+            zombie.reset()
+            self.free.append(zombie)
+
+    def spawn(self, pos, color, frames, idle_duration):
+        zombie = self.acquire()
+        if zombie is None:
+            return None
+        zombie.spawn(pos, color, frames)  # Sets position and rise target
+        zombie.idle_duration = idle_duration
+        self.moving[zombie] = None
+        # Motion stops the step after the zombie reaches the top, once prev_y has caught up
+        zombie.event = self.scheduler.after_steps(zombie.travel_steps(self.scheduler.step_ms) + 1, self.risen, zombie)
+        zombie.animation_event = self.scheduler.after(zombie.animation_speed, self.animate, zombie)
+        return zombie
+
+    def hit(self, zombie):
+        # zombie.check_hit() just succeeded: fade out wherever it is
+        self.scheduler.cancel(zombie.event)
+        self.moving[zombie] = None
+        zombie.event = self.scheduler.after(255 / zombie.fade_speed * 1000, self.leave, zombie)
+
+    def step(self, dt):
+        for zombie in self.moving:
+            zombie.update(dt)
+
+    def risen(self, zombie):
+        zombie.rising = False
+        del self.moving[zombie]
+        zombie.event = self.scheduler.after(zombie.idle_duration, self.fall, zombie)
+
+    def fall(self, zombie):
+        zombie.falling = True
+        self.moving[zombie] = None
+        zombie.event = self.scheduler.after_steps(zombie.travel_steps(self.scheduler.step_ms) + 1, self.sunk, zombie)
+
+    def sunk(self, zombie):
+        self.game_state.misses += 1
+        if self.on_miss is not None:
+            self.on_miss(zombie)
+        self.leave(zombie)
+
+    def leave(self, zombie):
+        # Left its hole (sunk or faded out): free both the hole and the zombie
+        self.scheduler.cancel(zombie.animation_event)
+        self.moving.pop(zombie, None)
+        zombie.reset()
+        self.on_leave(zombie)
+        self.release(zombie)
+
+    def animate(self, zombie):
+        zombie.animate()
+        zombie.animation_event = self.scheduler.after(zombie.animation_speed, self.animate, zombie)
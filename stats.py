@@ -0,0 +1,208 @@
+import argparse, queue, sqlite3, sys, threading, time
+import pygame
+
+from constants import STATS_DB, STATS_BATCH, STATS_FLUSH_MS
+
+# Persistent play statistics: one row per round, one per zombie hit or missed.
+#   rounds: when, seed, engine and hole count, then the result once it ends
+#           (completed = 0 for rounds abandoned from the pause menu). seed is
+#           only set for a session's first round: later rounds carry on the
+#           same random stream, so no seed reproduces them on its own.
+#   events: kind (HIT / MISS), sim time, hole slot, color, and for hits the
+#           reaction time in ms from the zombie appearing to the hit
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    seed INTEGER,
+    engine TEXT,
+    holes INTEGER,
+    score INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS rounds_score ON rounds (completed, score);
+CREATE TABLE IF NOT EXISTS events (
+    round_id INTEGER NOT NULL REFERENCES rounds (id),
+    kind INTEGER NOT NULL,
+    t REAL NOT NULL,
+    hole INTEGER NOT NULL,
+    color TEXT NOT NULL,
+    reaction REAL
+);
+CREATE INDEX IF NOT EXISTS events_round ON events (round_id, kind, reaction);
+CREATE INDEX IF NOT EXISTS events_reaction ON events (kind, reaction);
+"""
+HIT, MISS = range(2)
+
+# Posted to the pygame event queue when a finished round's summary is ready,
+# so a sleeping time's-up screen wakes up and shows it
+STATS_READY = pygame.event.custom_type()
+
+
+class StatsStore:
+    # The game thread only puts tuples on a queue. A writer thread owns the
+    # SQLite connection (WAL mode), commits events in batches, and after each
+    # finished round runs the queries for the time's-up screen, so neither
+    # writes nor queries ever hold up a frame.
+    def __init__(self, path=STATS_DB, batch=STATS_BATCH, flush_ms=STATS_FLUSH_MS):
+        self.path = path
+        self.batch = batch
+        self.flush_interval = flush_ms / 1000
+        self.queue = queue.SimpleQueue()
+        self.rounds = 0  # rounds begun this session; the queue refers to rounds by this number
+        self.summaries = {}  # round number -> summary, filled in by the writer
+        self.thread = threading.Thread(target=self.run, name="stats", daemon=True)
+        self.thread.start()
+
+    def begin_round(self, seed, engine, holes):
+        # Returns the round number to pass to event() and end_round()
+        self.rounds += 1
+        self.queue.put(('begin', self.rounds, time.time(), seed, engine, holes))
+        return self.rounds
+
+    def event(self, number, kind, t, hole, color, reaction=None):
+        self.queue.put(('event', number, kind, t, hole, color, reaction))
+
+    def end_round(self, number, game_state, completed):
+        self.queue.put(('end', number, game_state.score, game_state.hits, game_state.misses, completed))
+
+    def summary(self, number):
+        # Summary of a finished round (see summarize), or None while it is being written
+        return self.summaries.get(number)
+
+    def close(self):
+        # Write out whatever is queued and stop the writer
+        if self.thread.is_alive():
+            self.queue.put(('close',))
+            self.thread.join()
+
+    def run(self):
+        db = connect(self.path)
+        ids = {}  # round number -> rounds.id
+        while True:
+            # Events wait for a full batch or the flush interval; anything else
+            # (a round starting or ending, close) is written straight away
+            items = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while items[-1][0] == 'event' and len(items) < self.batch:
+                try:
+                    items.append(self.queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            finished = []
+            events = []
+            with db:  # one transaction per batch
+                for item in items:
+                    kind = item[0]
+                    if kind == 'event':
+                        events.append((ids[item[1]],) + item[2:])
+                        continue
+                    if events:
+                        db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events)
+                        events = []
+                    if kind == 'begin':
+                        ids[item[1]] = db.execute(
+                            "INSERT INTO rounds (played_at, seed, engine, holes) VALUES (?, ?, ?, ?)",
+                            item[2:]).lastrowid
+                    elif kind == 'end':
+                        number, score, hits, misses, completed = item[1:]
+                        db.execute("UPDATE rounds SET score = ?, hits = ?, misses = ?, completed = ? WHERE id = ?",
+                                   (score, hits, misses, int(completed), ids[number]))
+                        if completed:
+                            finished.append((number, score))
+                if events:
+                    db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)", events)
+
+            for number, score in finished:
+                self.summaries[number] = summarize(db, ids[number], score)
+                try:
+                    pygame.event.post(pygame.event.Event(STATS_READY, round=number))
+                except pygame.error:
+                    pass  # display already gone (shutting down, or headless without one)
+            if items[-1][0] == 'close':
+                db.close()
+                return
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode = WAL")
+    db.execute("PRAGMA synchronous = NORMAL")  # in WAL mode: durable per checkpoint, never corrupt
+    db.executescript(SCHEMA)
+    return db
+
+
+# Queries; each one is served by an index on its WHERE / ORDER BY columns
+
+def leaderboard(db, limit=10):
+    return db.execute("SELECT score, hits, misses, played_at FROM rounds WHERE completed = 1 "
+                      "ORDER BY score DESC LIMIT ?", (limit,)).fetchall()
+
+
+def score_rank(db, score):
+    # (rank of score among completed rounds, completed rounds)
+    (better,) = db.execute("SELECT COUNT(*) FROM rounds WHERE completed = 1 AND score > ?", (score,)).fetchone()
+    (total,) = db.execute("SELECT COUNT(*) FROM rounds WHERE completed = 1").fetchone()
+    return better + 1, total
+
+
+def reaction_percentiles(db, qs=(50, 90), round_id=None):
+    # Hit reaction times (ms) at each percentile in qs, over one round or all
+    # of them; None when there are no hits. OFFSET walks the covering index up
+    # to the percentile, so over all rounds the cost grows with the number of
+    # hits recorded. In the game it only runs on the writer thread.
+    where, args = "kind = ?", (HIT,)
+    if round_id is not None:
+        where, args = "round_id = ? AND kind = ?", (round_id, HIT)
+    (n,) = db.execute(f"SELECT COUNT(*) FROM events WHERE {where}", args).fetchone()
+    if not n:
+        return [None for _ in qs]
+    return [db.execute(f"SELECT reaction FROM events WHERE {where} ORDER BY reaction LIMIT 1 OFFSET ?",
+                       args + (min(n - 1, n * q // 100),)).fetchone()[0] for q in qs]
+
+
+def summarize(db, round_id, score):
+    # What the time's-up screen shows after a round
+    rank, rounds = score_rank(db, score)
+    best = leaderboard(db, 1)
+    (reaction,) = reaction_percentiles(db, (50,), round_id)
+    (overall,) = reaction_percentiles(db, (50,))
+    return {
+        'rank': rank,
+        'rounds': rounds,
+        'best': best[0][0] if best else score,
+        'reaction': reaction,
+        'overall_reaction': overall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show Whack a Zombie play statistics")
+    parser.add_argument("--db", default=STATS_DB, help=f"stats database (default {STATS_DB})")
+    parser.add_argument("--top", type=int, default=10, help="leaderboard size")
+    args = parser.parse_args()
+
+    db = connect(args.db)
+    print(f"{'#':>3}{'score':>7}{'hits':>6}{'misses':>8}  played")
+    for i, (score, hits, misses, played_at) in enumerate(leaderboard(db, args.top), 1):
+        print(f"{i:3}{score:7}{hits:6}{misses:8}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(played_at))}")
+    p50, p90, p99 = reaction_percentiles(db, (50, 90, 99))
+    if p50 is not None:
+        print(f"reaction time: p50 {p50:.0f} ms, p90 {p90:.0f} ms, p99 {p99:.0f} ms")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
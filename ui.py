@@ -1,20 +1,100 @@
 import pygame
-from constants import WIDTH, HEIGHT, WHITE, BLACK
+from collections import OrderedDict
+from constants import WIDTH, HEIGHT, WHITE, BLACK, DIRTY_RECTS, DIRTY_RECT_LIMIT, TEXT_CACHE_SIZE
+
+# HUD text placement: (align, x margin, top)
+HUD_LAYOUT = {
+    'score': ('center', 0, 20),
+    'hits': ('left', 20, 20),
+    'misses': ('left', 20, 60),
+    'accuracy': ('left', 20, 100),
+    'time': ('right', 20, 20),
+    'sound': ('right', 20, 60),
+}
+
+def accuracy(hits, misses):
+    if hits + misses > 0:
+        return (hits / (hits + misses)) * 100
+    return 0
+
+
+class TextCache:
+    # Bounded LRU of rendered text surfaces, keyed by (font, text, color)
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
 
 class GameUI:
-    def __init__(self, screen, fonts, images):
+    def __init__(self, screen, fonts, images, dirty_rects=DIRTY_RECTS, clock=pygame.time):
         self.screen = screen
         self.fonts = fonts
         self.images = images
+        self.clock = clock  # anything with get_ticks(), e.g. simulation.GameClock
         self.button_rects = {}
+        self.text_cache = TextCache()
+
+        # Dirty-rect state for draw_play
+        self.dirty_rects = dirty_rects
+        self.full_redraw = True
+        self.prev_rects = []  # rects drawn last frame that must be restored
+        self.hud = {}  # key -> (value, surface, rect)
+        self.play_bg = None
+        self.play_bg_holes = None
+
+        # Sprite atlas (hole, hammer, zombies), available once assets are loaded
+        self.atlas = None
+        self.hammer_frames = None
 
-    def draw_intro(self):
-        self.screen.blit(self.images['intro_bg'], (0, 0))
+        # Play field render resolution, see set_render_scale. The game itself,
+        # button rects and static screens stay at WIDTH x HEIGHT.
+        self.scale = 1.0
+        self.canvas = None  # backbuffer when the play field is not drawn at window size
+        self.mouse_scale = 1.0  # window pixels -> play field pixels
+        self.view_fonts = fonts
+        self.view_bg = None
+        self.view_atlas = None
+        self.area_map = None  # id(rect) in atlas -> rect in view_atlas, None at scale 1
 
-        title = self.fonts['large'].render("Whack a Zombie", True, WHITE)
-        self.screen.blit(title, (WIDTH//2 - title.get_width()//2, 200))
+        # Pre-composed menu screens: name -> (key, surface)
+        self.screens = {}
+        self.play_frame = None  # last play frame without the hammer, see capture_play
+        self.shown = None  # static screen surface currently on the display
 
-        press_start = self.fonts['small'].render("START", True, BLACK)
+    def draw_intro(self, progress=None):
+        # progress (0..1) is shown while assets are still loading; START is greyed out until then
+        key = None if progress is None else int(progress * 100)
+        return self.draw_static('intro', key, lambda surface: self.compose_intro(surface, progress))
+
+    def compose_intro(self, surface, progress):
+        surface.blit(self.images['intro_bg'], (0, 0))
+
+        title = self.render_text('large', "Whack a Zombie", WHITE)
+        surface.blit(title, (WIDTH//2 - title.get_width()//2, 200))
+
+        press_start = self.render_text('small', "START", BLACK)
         self.button_rects['start'] = pygame.Rect(
             WIDTH//2 - press_start.get_width()//2 - 10,
             400 - 10,
@@ -22,117 +102,314 @@ class GameUI:
             press_start.get_height() + 20
         )
 
-        pygame.draw.rect(self.screen, WHITE, self.button_rects['start'], border_radius=20)
-        self.screen.blit(press_start, (WIDTH//2 - press_start.get_width()//2, 400))
+        button_color = WHITE if progress is None else (128, 128, 128)
+        pygame.draw.rect(surface, button_color, self.button_rects['start'], border_radius=20)
+        surface.blit(press_start, (WIDTH//2 - press_start.get_width()//2, 400))
 
-    def draw_play(self, game_state, holes, zombies, hammer_state):
-        self.screen.blit(self.images['game_bg'], (0, 0))
+        if progress is not None:
+            bar = pygame.Rect(WIDTH//2 - 150, 480, 300, 16)
+            pygame.draw.rect(surface, BLACK, bar, border_radius=8)
+            fill = bar.inflate(-4, -4)
+            fill.width = int(fill.width * progress)
+            if fill.width > 0:
+                pygame.draw.rect(surface, WHITE, fill, border_radius=6)
+            loading = self.render_text('small', f"Loading... {int(progress * 100)}%", WHITE)
+            surface.blit(loading, (WIDTH//2 - loading.get_width()//2, 510))
 
-        # Draw holes
-        for pos in holes:
-            self.screen.blit(self.images['hole'], pos)
+    def draw_play(self, game_state, holes, zombies, hammer_state, interp=1.0):
+        # Returns the rects that changed, or None when the whole screen was redrawn
+        self.shown = None
+        if self.play_bg is None or self.play_bg_holes is not holes:
+            self.build_play_bg(holes)
+        target = self.canvas or self.screen
+        scale = self.scale
 
-        # Draw zombies
-        for zombie in zombies:
-            zombie.draw(self.screen)
+        # Past a point (e.g. huge boards) one full update beats many small ones
+        full = self.full_redraw or not self.dirty_rects or len(self.prev_rects) > DIRTY_RECT_LIMIT
+        restored = [] if full else self.prev_rects
 
-        # Draw score and stats
-        score_text = self.fonts['large'].render(f"Score: {game_state.score}", True, (255, 255, 0))
-        self.screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, 20))
+        # Re-render HUD lines whose text changed; their old and new areas need repainting
+        hud_redraw = []
+        for key, value in self.hud_values(game_state):
+            entry = self.hud.get(key)
+            if entry is None or entry[0] != value:
+                surface = self.render_hud(key, value, self.view_fonts)
+                rect = self.hud_rect(key, surface, scale)
+                if entry is not None and not full:
+                    restored.append(entry[2])
+                self.hud[key] = (value, surface, rect)
+                hud_redraw.append(key)
 
-        hits_text = self.fonts['small'].render(f"Hits: {game_state.hits}", True, (0, 255, 0))
-        misses_text = self.fonts['small'].render(f"Misses: {game_state.misses}", True, (255, 0, 0))
+        if full:
+            hud_redraw = list(self.hud)
+        else:
+            # Unchanged text touched by a restored area is repainted as a whole,
+            # otherwise its antialiased edges would be blended twice
+            grown = True
+            while grown:
+                grown = False
+                for key, (value, surface, rect) in self.hud.items():
+                    if key not in hud_redraw and rect.collidelist(restored) != -1:
+                        hud_redraw.append(key)
+                        grown = True
+            for key in hud_redraw:
+                restored.append(self.hud[key][2])
 
-        if game_state.hits + game_state.misses > 0:
-            accuracy = (game_state.hits / (game_state.hits + game_state.misses)) * 100
+        # Restore the background (with holes) under everything that moved or changed
+        if full:
+            target.blit(self.view_bg, (0, 0))
         else:
-            accuracy = 0
-        accuracy_text = self.fonts['small'].render(f"Accuracy: {accuracy:.1f}%", True, WHITE)
+            for rect in restored:
+                target.blit(self.view_bg, rect, rect)
 
-        self.screen.blit(hits_text, (20, 20))
-        self.screen.blit(misses_text, (20, 60))
-        self.screen.blit(accuracy_text, (20, 100))
+        drawn = []
 
-        seconds_left = game_state.time_left // 1000
-        time_text = self.fonts['small'].render(f"Time: {seconds_left}", True, WHITE)
-        self.screen.blit(time_text, (WIDTH - time_text.get_width() - 20, 20))
+        sprites = self.zombie_sprites(zombies, interp)
+        if self.area_map is not None:
+            atlas, areas = self.view_atlas.surface, self.area_map
+            sprites = [(atlas, (round(x * scale), round(y * scale)), areas[id(area)])
+                       for _, (x, y), area in sprites]
+        drawn.extend(target.blits(sprites))
 
-        sound_text = self.fonts['small'].render(
-            "Music: ON" if game_state.sound_enabled else "Music: OFF", True, WHITE)
-        self.screen.blit(sound_text, (WIDTH - sound_text.get_width() - 20, 60))
+        # Draw score and stats, only where they were painted over
+        for key in hud_redraw:
+            value, surface, rect = self.hud[key]
+            target.blit(surface, rect)
 
         # Draw hammer cursor
         if not hammer_state['cursor_visible']:
             pygame.mouse.set_visible(False)
             mx, my = pygame.mouse.get_pos()
-            hammer_img = self.images['hammer']
-            
+            mx, my = round(mx * self.mouse_scale), round(my * self.mouse_scale)
+            swing = self.hammer_frames
+            hammer_area = swing[0]
+
             if hammer_state['hammer_swing']:
-                elapsed = pygame.time.get_ticks() - hammer_state['hammer_swing_start']
+                elapsed = self.clock.get_ticks() - hammer_state['hammer_swing_start']
                 if elapsed < hammer_state['hammer_swing_duration']:
                     progress = elapsed / hammer_state['hammer_swing_duration']
-                    angle = 45 * (1 - progress)
-                    hammer_img = pygame.transform.rotate(self.images['hammer'], angle)
+                    # Swing goes from the full angle back to upright
+                    hammer_area = swing[round((1 - progress) * (len(swing) - 1))]
+
+            if self.area_map is not None:
+                hammer_area = self.area_map[id(hammer_area)]
+            pos = (mx - round(40 * scale), my - round(10 * scale))
+            drawn.append(target.blit(self.view_atlas.surface, pos, hammer_area))
+
+        # Whatever we drew this frame has to be restored next frame
+        self.prev_rects = drawn
+        self.full_redraw = False
+        if self.canvas is not None:
+            # One scaling pass of the whole play field to the window
+            pygame.transform.scale(self.canvas, self.screen.get_size(), self.screen)
+            return None
+        if full:
+            return None
+        return restored + drawn
+
+    def set_atlas(self, atlas):
+        self.atlas = atlas
+        self.hammer_frames = atlas['hammer']
+        self.play_bg = None
+        self.scale_atlas()
+
+    def set_render_scale(self, scale, fonts):
+        # Draw the play field at scale x WIDTH x HEIGHT with fonts sized to match.
+        # Unless that is the window size it goes to a backbuffer that is scaled
+        # to the window once per frame; scale < 1 trades sharpness for fill rate.
+        self.scale = scale
+        self.view_fonts = fonts
+        size = (round(WIDTH * scale), round(HEIGHT * scale))
+        window = self.screen.get_size()
+        self.canvas = None if size == window else pygame.Surface(size, 0, self.screen)
+        self.mouse_scale = size[0] / window[0]
+        self.hud = {}
+        self.prev_rects = []
+        self.play_bg = None
+        self.full_redraw = True
+        self.scale_atlas()
 
-            self.screen.blit(hammer_img, (mx - 40, my - 10))
+    def scale_atlas(self):
+        if self.atlas is None:
+            return
+        if self.scale == 1:
+            self.view_atlas, self.area_map = self.atlas, None
+        else:
+            self.view_atlas, self.area_map = self.atlas.scaled(self.scale)
+
+    def zombie_sprites(self, zombies, interp):
+        # zombies is either a per-hole list of Zombie (None for empty holes) or an
+        # array-backed ZombieField; either way (atlas, pos, area) blits in logical pixels
+        if hasattr(zombies, 'sprites'):
+            return zombies.sprites(interp)
+        return [zombie.sprite(interp) for zombie in zombies if zombie is not None and zombie.active]
+
+    def draw_zombies(self, target, zombies, interp):
+        # One Surface.blits call of atlas areas
+        return target.blits(self.zombie_sprites(zombies, interp))
+
+    def build_play_bg(self, holes):
+        # Static play field: background with all holes baked in
+        self.play_bg = self.images['game_bg'].copy()
+        self.play_bg.blits([(self.atlas.surface, pos, self.atlas['hole']) for pos in holes], False)
+        self.play_bg_holes = holes
+        self.view_bg = self.play_bg
+        if self.scale != 1:
+            size = (round(WIDTH * self.scale), round(HEIGHT * self.scale))
+            self.view_bg = pygame.transform.smoothscale(self.play_bg, size)
+        self.full_redraw = True
+
+    def hud_values(self, game_state):
+        # Raw GameState values behind each HUD line; text is only rebuilt when these change
+        return (
+            ('score', game_state.score),
+            ('hits', game_state.hits),
+            ('misses', game_state.misses),
+            ('accuracy', (game_state.hits, game_state.misses)),
+            ('time', int(game_state.time_left) // 1000),
+            ('sound', game_state.sound_enabled),
+        )
+
+    def render_hud(self, key, value, fonts=None):
+        if key == 'score':
+            return self.render_text('large', f"Score: {value}", (255, 255, 0), fonts)
+        if key == 'hits':
+            return self.render_text('small', f"Hits: {value}", (0, 255, 0), fonts)
+        if key == 'misses':
+            return self.render_text('small', f"Misses: {value}", (255, 0, 0), fonts)
+        if key == 'accuracy':
+            return self.render_text('small', f"Accuracy: {accuracy(*value):.1f}%", WHITE, fonts)
+        if key == 'time':
+            return self.render_text('small', f"Time: {value}", WHITE, fonts)
+        return self.render_text('small', "Music: ON" if value else "Music: OFF", WHITE, fonts)
+
+    def render_text(self, font, text, color, fonts=None):
+        return self.text_cache.render((fonts or self.fonts)[font], text, color)
+
+    def hud_rect(self, key, surface, scale=1.0):
+        align, x, y = HUD_LAYOUT[key]
+        rect = surface.get_rect(top=round(y * scale))
+        if align == 'center':
+            rect.centerx = round(WIDTH * scale) // 2
+        elif align == 'right':
+            rect.right = round((WIDTH - x) * scale)
+        else:
+            rect.left = round(x * scale)
+        return rect
 
-    def draw_timesup(self, game_state):
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+    def add_overlay(self, rect):
+        # Something was drawn over the frame (e.g. the profiler); restore it next
+        # frame. A backbuffer is copied over the whole window every frame anyway.
+        if self.canvas is None:
+            self.prev_rects.append(rect)
 
-        title = self.fonts['large'].render("TIME'S UP!", True, (255, 0, 0))
-        self.screen.blit(title, (WIDTH//2 - title.get_width()//2, 150))
+    def invalidate(self):
+        # Force the next draw_play to repaint (and update) the whole screen
+        self.full_redraw = True
+
+    def draw_timesup(self, game_state, summary=None):
+        # summary: the round's saved stats (stats.summarize), None until written
+        key = (game_state.score, game_state.hits, game_state.misses, summary)
+        return self.draw_static('timesup', key, lambda surface: self.compose_timesup(surface, game_state, summary))
+
+    def compose_timesup(self, surface, game_state, summary=None):
+        self.compose_shaded(surface)
+
+        title = self.render_text('large', "TIME'S UP!", (255, 0, 0))
+        surface.blit(title, (WIDTH//2 - title.get_width()//2, 150))
 
         stats = [
             f"Score: {game_state.score}",
             f"Hits: {game_state.hits}",
             f"Misses: {game_state.misses}",
         ]
-        if game_state.hits + game_state.misses > 0:
-            accuracy = (game_state.hits / (game_state.hits + game_state.misses)) * 100
-        else:
-            accuracy = 0
-        stats.append(f"Accuracy: {accuracy:.1f}%")
+        stats.append(f"Accuracy: {accuracy(game_state.hits, game_state.misses):.1f}%")
 
         for i, text in enumerate(stats):
-            line = self.fonts['small'].render(text, True, WHITE)
-            self.screen.blit(line, (WIDTH//2 - line.get_width()//2, 250 + i*50))
+            line = self.render_text('small', text, WHITE)
+            surface.blit(line, (WIDTH//2 - line.get_width()//2, 250 + i*50))
 
         # Buttons
-        play_again_text = self.fonts['small'].render("Play Again", True, BLACK)
-        intro_text = self.fonts['small'].render("Go Back", True, BLACK)
+        play_again_text = self.render_text('small', "Play Again", BLACK)
+        intro_text = self.render_text('small', "Go Back", BLACK)
 
         self.button_rects['play_again'] = pygame.Rect(WIDTH//2 - 150, 450, 300, 50)
         self.button_rects['intro'] = pygame.Rect(WIDTH//2 - 150, 520, 300, 50)
 
-        pygame.draw.rect(self.screen, WHITE, self.button_rects['play_again'], border_radius=15)
-        pygame.draw.rect(self.screen, WHITE, self.button_rects['intro'], border_radius=15)
+        pygame.draw.rect(surface, WHITE, self.button_rects['play_again'], border_radius=15)
+        pygame.draw.rect(surface, WHITE, self.button_rects['intro'], border_radius=15)
+
+        surface.blit(play_again_text, (WIDTH//2 - play_again_text.get_width()//2, 460))
+        surface.blit(intro_text, (WIDTH//2 - intro_text.get_width()//2, 530))
 
-        self.screen.blit(play_again_text, (WIDTH//2 - play_again_text.get_width()//2, 460))
-        self.screen.blit(intro_text, (WIDTH//2 - intro_text.get_width()//2, 530))
+        if summary is not None:
+            lines = [f"Best: {summary['best']}   Rank: {summary['rank']} of {summary['rounds']}"]
+            if summary['reaction'] is not None:
+                lines.append(f"Reaction: {summary['reaction']:.0f} ms (all rounds: {summary['overall_reaction']:.0f} ms)")
+            for i, text in enumerate(lines):
+                line = self.render_text('small', text, WHITE)
+                surface.blit(line, (WIDTH//2 - line.get_width()//2, 600 + i*45))
 
     def draw_pause(self):
-        overlay = pygame.Surface((WIDTH, HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        return self.draw_static('pause', None, self.compose_pause)
 
-        title = self.fonts['large'].render("PAUSED", True, (255, 255, 0))
-        self.screen.blit(title, (WIDTH//2 - title.get_width()//2, 200))
+    def compose_pause(self, surface):
+        self.compose_shaded(surface)
 
-        continue_text = self.fonts['small'].render("Continue", True, BLACK)
-        intro_text = self.fonts['small'].render("Go Back", True, BLACK)
+        title = self.render_text('large', "PAUSED", (255, 255, 0))
+        surface.blit(title, (WIDTH//2 - title.get_width()//2, 200))
+
+        continue_text = self.render_text('small', "Continue", BLACK)
+        intro_text = self.render_text('small', "Go Back", BLACK)
 
         self.button_rects['continue'] = pygame.Rect(WIDTH//2 - 150, 350, 300, 50)
         self.button_rects['pause_intro'] = pygame.Rect(WIDTH//2 - 150, 420, 300, 50)
 
-        pygame.draw.rect(self.screen, WHITE, self.button_rects['continue'], border_radius=15)
-        pygame.draw.rect(self.screen, WHITE, self.button_rects['pause_intro'], border_radius=15)
+        pygame.draw.rect(surface, WHITE, self.button_rects['continue'], border_radius=15)
+        pygame.draw.rect(surface, WHITE, self.button_rects['pause_intro'], border_radius=15)
+
+        surface.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, 360))
+        surface.blit(intro_text, (WIDTH//2 - intro_text.get_width()//2, 430))
+
+    def compose_shaded(self, surface):
+        # The last play frame (or the bare background) dimmed under a menu
+        surface.blit(self.play_frame or self.images['game_bg'], (0, 0))
+        shade = pygame.Surface((WIDTH, HEIGHT))
+        shade.set_alpha(180)
+        shade.fill((0, 0, 0))
+        surface.blit(shade, (0, 0))
+
+    def draw_static(self, name, key, compose):
+        # Menu screens are composed once into a full-screen surface and then only
+        # blitted; compose(surface) runs again only when key (what is shown) changes
+        # Returns True if the screen now shows something it did not show before
+        cached = self.screens.get(name)
+        if cached is None or cached[0] != key:
+            surface = pygame.Surface((WIDTH, HEIGHT), 0, self.screen)
+            compose(surface)
+            if surface.get_size() != self.screen.get_size():
+                # Composed in logical pixels like the button rects, shown at window size
+                surface = pygame.transform.smoothscale(surface, self.screen.get_size())
+            cached = self.screens[name] = (key, surface)
+        changed = self.shown is not cached[1]
+        self.shown = cached[1]
+        self.full_redraw = True
+        self.screen.blit(cached[1], (0, 0))
+        return changed
 
-        self.screen.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, 360))
-        self.screen.blit(intro_text, (WIDTH//2 - intro_text.get_width()//2, 430))
+    def capture_play(self, game_state, holes, zombies, interp=1.0):
+        # Snapshot of the play field as last shown, minus the hammer, to sit
+        # under the pause and time's-up screens
+        if self.play_bg is None or self.play_bg_holes is not holes:
+            self.build_play_bg(holes)
+        frame = self.play_bg.copy()
+        self.draw_zombies(frame, zombies, interp)
+        for key, value in self.hud_values(game_state):
+            surface = self.render_hud(key, value)
+            frame.blit(surface, self.hud_rect(key, surface))
+        self.play_frame = frame
+        self.screens.pop('pause', None)
+        self.screens.pop('timesup', None)
 
     def get_button_rects(self):
         return self.button_rects
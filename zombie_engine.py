@@ -0,0 +1,132 @@
+from itertools import repeat
+
+import numpy as np
+
+# Zombie lifecycle phases
+INACTIVE, RISING, IDLE, FALLING, FADING = range(5)
+
+class ZombieField:
+    # Struct-of-arrays zombie store for large boards: one slot per hole, and
+    # every step advances rise, idle, fall and fade for all slots at once.
+    # Timings match sprites.zombie.Zombie.
+    def __init__(self, layout, frames, game_state, colors=("green", "red")):
+        self.layout = layout
+        self.game_state = game_state
+        self.colors = colors
+
+        self.speed = 300  # pixels per second
+        self.fade_speed = 600  # alpha per second
+        self.idle_duration = 1000
+        self.animation_speed = 200
+        self.on_miss = None  # called with (slot, color) for each zombie that sinks back unhit
+
+        n = len(layout.holes)
+        anchors = np.array([layout.anchor(pos) for pos in layout.holes], dtype=float).reshape(n, 2)
+        self.width, self.height = layout.zombie_size
+        self.x = (anchors[:, 0] - self.width // 2).astype(int)
+        self.base_y = anchors[:, 1]
+        self.target_y = self.base_y - layout.rise
+        self.y = self.base_y.copy()
+        self.prev_y = self.base_y.copy()
+
+        self.phase = np.zeros(n, dtype=np.int8)
+        self.color = np.zeros(n, dtype=np.int8)  # index into colors
+        self.idle_timer = np.zeros(n)
+        self.alpha = np.full(n, 255.0)
+        self.frame = np.zeros(n, dtype=np.int8)
+        self.animation_timer = np.zeros(n)
+
+        # Flat table of atlas rects indexed by ((color * 2 + dead) * frames + frame) * levels + level
+        self.atlas = frames[colors[0]]["atlas"]
+        self.frame_count = len(frames[colors[0]]["idle"])
+        self.levels = len(frames[colors[0]]["fade"][0])
+        self.areas = []
+        for name in colors:
+            for dead in (False, True):
+                for f in range(self.frame_count):
+                    if dead:
+                        self.areas.extend(frames[name]["fade"][f])
+                    else:
+                        self.areas.extend([frames[name]["idle"][f]] * self.levels)
+
+    def clear(self):
+        self.phase[:] = INACTIVE
+        self.y[:] = self.base_y
+        self.prev_y[:] = self.base_y
+
+    def spawn(self, slots, colors):
+        # slots: hole indices (must be inactive); colors: matching color indices
+        self.phase[slots] = RISING
+        self.color[slots] = colors
+        self.y[slots] = self.base_y[slots]
+        self.prev_y[slots] = self.base_y[slots]
+        self.idle_timer[slots] = 0
+        self.alpha[slots] = 255
+        self.frame[slots] = 0
+        self.animation_timer[slots] = 0
+
+    def free_slots(self):
+        return np.flatnonzero(self.phase == INACTIVE)
+
+    def step(self, dt):
+        # dt is the fixed simulation step in ms
+        phase = self.phase
+        self.prev_y[:] = self.y
+        move = self.speed * dt / 1000
+
+        active = phase != INACTIVE
+        self.animation_timer[active] += dt
+        flip = active & (self.animation_timer >= self.animation_speed)
+        self.animation_timer[flip] = 0
+        self.frame[flip] = (self.frame[flip] + 1) % self.frame_count
+
+        fading = phase == FADING
+        self.alpha[fading] -= self.fade_speed * dt / 1000
+        phase[fading & (self.alpha <= 0)] = INACTIVE
+
+        rising = phase == RISING
+        self.y[rising] = np.maximum(self.target_y[rising], self.y[rising] - move)
+        risen = rising & (self.y <= self.target_y)
+        phase[risen] = IDLE
+        self.idle_timer[risen] = 0
+
+        idle = (phase == IDLE) & ~risen
+        self.idle_timer[idle] += dt
+        phase[idle & (self.idle_timer >= self.idle_duration)] = FALLING
+
+        falling = (phase == FALLING) & ~idle
+        self.y[falling] = np.minimum(self.base_y[falling], self.y[falling] + move)
+        sunk = falling & (self.y >= self.base_y)
+        phase[sunk] = INACTIVE
+        self.game_state.misses += int(np.count_nonzero(sunk))
+        if self.on_miss is not None and sunk.any():
+            for slot in np.flatnonzero(sunk).tolist():
+                self.on_miss(slot, self.colors[self.color[slot]])
+
+    def hit(self, pos, slots):
+        # Hit-test pos against the zombies in slots (topmost first); returns the slot hit
+        px, py = pos
+        for slot in slots:
+            if RISING <= self.phase[slot] <= FALLING:
+                left = self.x[slot]
+                bottom = round(self.y[slot])
+                if left <= px < left + self.width and bottom - self.height <= py < bottom:
+                    self.phase[slot] = FADING
+                    self.alpha[slot] = 255
+                    self.frame[slot] = 0
+                    self.animation_timer[slot] = 0
+                    return slot
+        return None
+
+    def sprites(self, interp=1.0):
+        # (atlas, position, area) for every visible zombie, for Surface.blits
+        slots = np.flatnonzero(self.phase)
+        if not slots.size:
+            return []
+        prev_y = self.prev_y[slots]
+        tops = np.rint(prev_y + (self.y[slots] - prev_y) * interp).astype(int) - self.height
+        dead = self.phase[slots] == FADING
+        level = np.where(dead, np.rint(self.alpha[slots] * (self.levels - 1) / 255), self.levels - 1)
+        codes = ((self.color[slots].astype(int) * 2 + dead) * self.frame_count + self.frame[slots]) * self.levels + level.astype(int)
+        return list(zip(repeat(self.atlas), zip(self.x[slots].tolist(), tops.tolist()),
+                        map(self.areas.__getitem__, codes.tolist())))